@@ -0,0 +1,70 @@
+"""
+Import-Time Benchmark for Brazil Hydro Energy Sector Analysis
+Measures the cold import cost of each package and which plotting stacks it pulls in
+"""
+
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+# Statements timed in a fresh interpreter, from lightest to heaviest
+TARGETS = [
+    'import src.data_processing',
+    'import src.visualization',
+    'from src.data_processing import HydroDataLoader',
+    'from src.visualization import HydroChartGenerator',
+    'from src.visualization import HydroChartGenerator; HydroChartGenerator()',
+]
+
+HEAVY_MODULES = ['pandas', 'plotly', 'matplotlib', 'seaborn']
+
+PROBE = """
+import sys, time
+start = time.perf_counter()
+{statement}
+elapsed = time.perf_counter() - start
+print(elapsed)
+print(','.join(m for m in {heavy!r} if m in sys.modules))
+"""
+
+def time_import(statement, repeat=5):
+    """
+    Time a statement in fresh interpreters
+    
+    Args:
+        statement (str): Python statement to execute
+        repeat (int): Number of interpreter runs
+    
+    Returns:
+        tuple: (median seconds, heavy modules loaded by the statement),
+            or None if the statement fails (e.g. a missing dependency)
+    """
+    timings = []
+    loaded = ''
+    for _ in range(repeat):
+        result = subprocess.run(
+            [sys.executable, '-c', PROBE.format(statement=statement, heavy=HEAVY_MODULES)],
+            cwd=PROJECT_ROOT, capture_output=True, text=True
+        )
+        if result.returncode != 0:
+            return None
+        elapsed, loaded = result.stdout.split('\n')[-3:-1]
+        timings.append(float(elapsed))
+    return statistics.median(timings), loaded
+
+def main():
+    """Run the import-time benchmark"""
+    print(f"{'statement':<75} {'median ms':>10}  modules loaded")
+    for statement in TARGETS:
+        result = time_import(statement)
+        if result is None:
+            print(f"{statement:<75} {'failed':>10}")
+            continue
+        elapsed, loaded = result
+        print(f"{statement:<75} {elapsed * 1000:>10.1f}  {loaded or '-'}")
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,202 @@
+"""
+Benchmark Suite for Brazil Hydro Energy Sector Analysis
+Times the loader, aggregations and chart construction across dataset sizes,
+tracks peak memory and flags regressions against a stored baseline
+
+Usage:
+    python benchmarks/run_benchmarks.py                     # run and compare with baseline
+    python benchmarks/run_benchmarks.py --update-baseline   # run and store as the new baseline
+    python benchmarks/run_benchmarks.py --sizes 1000 100000 --repeat 3
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+BENCHMARK_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(BENCHMARK_DIR.parent))
+from src.data_processing import HydroDataLoader, SyntheticDataGenerator
+from src.visualization import HydroChartGenerator
+
+DEFAULT_SIZES = [1_000, 100_000, 1_000_000]
+DEFAULT_BASELINE = BENCHMARK_DIR / "baseline.json"
+DEFAULT_OUTPUT = BENCHMARK_DIR / "results" / "latest.json"
+# A case regresses when its best time grows by more than this fraction...
+DEFAULT_THRESHOLD = 0.2
+# ...and by more than this many seconds, so sub-millisecond noise is ignored
+NOISE_FLOOR_S = 0.002
+
+def make_fixtures(market_summary):
+    """Small inputs for the chart methods that do not read the raw datasets"""
+    last_year = int(market_summary['year'].max())
+    last_value = float(market_summary['market_value_million_usd'].iloc[-1])
+    forecast = pd.DataFrame({
+        'year': np.arange(last_year + 1, last_year + 7),
+        'market_value_forecast': last_value * 1.04 ** np.arange(1, 7),
+    })
+    technology = pd.DataFrame({
+        'technology': ['Conventional Hydro', 'Pumped Storage', 'Small Hydro', 'Micro Hydro'],
+        'current_share': [70, 12, 13, 5],
+        'forecast_2030': [60, 18, 15, 7],
+    })
+    risk = pd.DataFrame({
+        'risk_factor': ['Drought', 'Regulation', 'Grid Access', 'Financing', 'Environmental Licensing'],
+        'risk_score': [8.2, 6.5, 5.9, 6.8, 7.4],
+    })
+    return forecast, technology, risk
+
+def build_cases(data_path, out_dir):
+    """
+    Return (name, callable) benchmark cases for one synthetic data directory
+    
+    Every callable is self-contained so it can be timed repeatedly.
+    """
+    loader = HydroDataLoader(data_path, use_cache=False, memory_budget=0)
+    charts = HydroChartGenerator()
+    market = loader.load_market_data()
+    competitor = loader.load_competitor_data()
+    customer = loader.load_customer_data()
+    summary = loader.get_market_summary(market)
+    regional = loader.get_regional_analysis(market)
+    forecast, technology, risk = make_fixtures(summary)
+    trends_fig = charts.create_market_trends_chart(summary)
+    
+    return [
+        ('load_market_data', loader.load_market_data),
+        ('get_market_summary', lambda: loader.get_market_summary(market)),
+        ('get_regional_analysis', lambda: loader.get_regional_analysis(market)),
+        ('create_market_trends_chart', lambda: charts.create_market_trends_chart(summary)),
+        ('create_regional_analysis_chart', lambda: charts.create_regional_analysis_chart(regional)),
+        ('create_competitor_analysis_chart', lambda: charts.create_competitor_analysis_chart(competitor)),
+        ('create_customer_segmentation_chart', lambda: charts.create_customer_segmentation_chart(customer)),
+        ('create_forecast_chart', lambda: charts.create_forecast_chart(summary, forecast)),
+        ('create_technology_adoption_chart', lambda: charts.create_technology_adoption_chart(technology)),
+        ('create_risk_analysis_chart', lambda: charts.create_risk_analysis_chart(risk)),
+        ('save_chart', lambda: charts.save_chart(trends_fig, str(out_dir / "market_trends.html"))),
+    ]
+
+def measure(func, repeat):
+    """
+    Time a callable and measure its peak traced allocation
+    
+    Returns:
+        dict: min/median seconds over `repeat` runs and peak MiB of one traced run
+    """
+    timings = []
+    with contextlib.redirect_stdout(io.StringIO()):
+        for _ in range(repeat):
+            start = time.perf_counter()
+            func()
+            timings.append(time.perf_counter() - start)
+        
+        # Memory is traced in a separate run so tracing overhead does not skew timings
+        tracemalloc.start()
+        try:
+            func()
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+    
+    return {
+        'min_s': min(timings),
+        'median_s': statistics.median(timings),
+        'peak_mib': peak / 2 ** 20,
+    }
+
+def run(sizes, repeat):
+    """Run every case at every size and return the results document"""
+    results = {}
+    generator = SyntheticDataGenerator(seed=0)
+    for size in sizes:
+        with tempfile.TemporaryDirectory() as tmp:
+            tmp = Path(tmp)
+            with contextlib.redirect_stdout(io.StringIO()):
+                generator.write_all(tmp / "data", size)
+                cases = build_cases(tmp / "data", tmp)
+            for name, func in cases:
+                key = f"{name}[{size}]"
+                results[key] = measure(func, repeat)
+                stats = results[key]
+                print(f"{key:<50} {stats['median_s'] * 1000:>10.2f} ms {stats['peak_mib']:>9.1f} MiB")
+    
+    return {
+        'meta': {
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'pandas': pd.__version__,
+            'numpy': np.__version__,
+            'machine': platform.machine(),
+            'sizes': sizes,
+            'repeat': repeat,
+        },
+        'results': results,
+    }
+
+def compare(current, baseline, threshold=DEFAULT_THRESHOLD):
+    """
+    Compare a results document with a baseline
+    
+    Best-of-N times are compared since they are the least sensitive to noise.
+    
+    Returns:
+        list: (case, baseline best s, current best s) for every regression
+    """
+    regressions = []
+    for key, stats in current['results'].items():
+        reference = baseline['results'].get(key)
+        if reference is None:
+            continue
+        before, after = reference['min_s'], stats['min_s']
+        if after > before * (1 + threshold) and after - before > NOISE_FLOOR_S:
+            regressions.append((key, before, after))
+    return regressions
+
+def main():
+    """Run the benchmark suite from the command line"""
+    parser = argparse.ArgumentParser(description="Run the hydro analysis benchmark suite")
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--output', type=Path, default=DEFAULT_OUTPUT)
+    parser.add_argument('--baseline', type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD)
+    parser.add_argument('--update-baseline', action='store_true',
+                        help="Store this run as the new baseline")
+    args = parser.parse_args()
+    
+    current = run(args.sizes, args.repeat)
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    args.output.write_text(json.dumps(current, indent=2))
+    print(f"\nResults saved: {args.output}")
+    
+    if args.update_baseline:
+        args.baseline.write_text(json.dumps(current, indent=2))
+        print(f"Baseline updated: {args.baseline}")
+        return 0
+    
+    if not args.baseline.exists():
+        print("No baseline found; run with --update-baseline to create one")
+        return 0
+    
+    regressions = compare(current, json.loads(args.baseline.read_text()), args.threshold)
+    if regressions:
+        print(f"\n{len(regressions)} regression(s) over {args.threshold:.0%}:")
+        for key, before, after in regressions:
+            print(f"  {key:<50} {before * 1000:>10.2f} ms -> {after * 1000:>10.2f} ms")
+        return 1
+    print("No regressions against baseline")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
\ No newline at end of file
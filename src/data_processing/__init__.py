@@ -2,6 +2,34 @@
 Data Processing Module for Brazil Hydro Energy Sector Analysis
 """
 
-from .data_loader import HydroDataLoader
+import importlib
 
-__all__ = ['HydroDataLoader'] 
\ No newline at end of file
+# Submodules are imported on first attribute access (PEP 562)
+_LAZY_ATTRS = {
+    'HydroDataLoader': '.data_loader',
+    'HydroDatasets': '.data_loader',
+    'BuildGraph': '.build_graph',
+    'BuildReport': '.build_graph',
+    'IncrementalMarketSummary': '.market_summary',
+    'MarketCube': '.market_cube',
+    'SyntheticDataGenerator': '.synthetic_data',
+    'MetricsHook': '.metrics',
+    'NullMetricsHook': '.metrics',
+    'LoggingMetricsHook': '.metrics',
+    'InMemoryMetricsHook': '.metrics',
+    'StageMetrics': '.metrics',
+}
+
+__all__ = ['HydroDataLoader', 'HydroDatasets', 'BuildGraph', 'BuildReport',
+           'IncrementalMarketSummary', 'MarketCube', 'SyntheticDataGenerator', 'MetricsHook',
+           'NullMetricsHook', 'LoggingMetricsHook', 'InMemoryMetricsHook', 'StageMetrics']
+
+def __getattr__(name):
+    if name in _LAZY_ATTRS:
+        value = getattr(importlib.import_module(_LAZY_ATTRS[name], __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
\ No newline at end of file
@@ -0,0 +1,354 @@
+"""
+Build Graph Module for Brazil Hydro Energy Sector Analysis
+Runs pipeline steps incrementally, skipping those whose content-hashed inputs
+match the last successful run
+"""
+
+from concurrent.futures import (FIRST_COMPLETED, Future, ProcessPoolExecutor,
+                                ThreadPoolExecutor, wait)
+from dataclasses import dataclass, field
+from pathlib import Path
+import hashlib
+import json
+import logging
+import os
+import time
+
+try:
+    from .metrics import NullMetricsHook, StageMetrics
+except ImportError:
+    # Allow running alongside data_loader as a script
+    from metrics import NullMetricsHook, StageMetrics
+
+logger = logging.getLogger(__name__)
+
+# Bump when the layout of the state file changes; older state is discarded
+STATE_VERSION = 1
+
+EXECUTORS = ('thread', 'process')
+
+@dataclass
+class BuildStep:
+    """One node of the build graph"""
+    name: str
+    func: object
+    deps: list = field(default_factory=list)
+    # Raw files read by the step, or a callable returning them
+    sources: object = field(default_factory=list)
+    # Files written by the step; it reruns when any of them is missing
+    outputs: list = field(default_factory=list)
+    # Change to invalidate the step when its code changes
+    version: str = '1'
+
+@dataclass
+class BuildReport:
+    """Steps built and skipped by one BuildGraph.run"""
+    built: list = field(default_factory=list)
+    skipped: list = field(default_factory=list)
+    # Seconds per built step, and its (start, end) offsets from the start of the run
+    timings: dict = field(default_factory=dict)
+    spans: dict = field(default_factory=dict)
+    critical_path: list = field(default_factory=list)
+    duration_s: float = 0.0
+    
+    @property
+    def hit_rate(self):
+        """Fraction of steps served from the previous run"""
+        total = len(self.built) + len(self.skipped)
+        return len(self.skipped) / total if total else 0.0
+    
+    @property
+    def critical_path_s(self):
+        """Total duration of the steps on the critical path"""
+        return sum(self.timings[name] for name in self.critical_path)
+    
+    @property
+    def parallelism(self):
+        """Summed step time over wall time"""
+        return sum(self.timings.values()) / self.duration_s if self.duration_s > 0 else 0.0
+    
+    def summary(self):
+        return (f"Build: {len(self.built)} built, {len(self.skipped)} skipped "
+                f"({self.hit_rate:.0%} hits) in {self.duration_s * 1000:.1f} ms")
+    
+    def timing_report(self):
+        """Per-step timeline with the critical path marked, slowest first"""
+        lines = [self.summary(),
+                 f"Step time {sum(self.timings.values()) * 1000:.1f} ms, "
+                 f"critical path {self.critical_path_s * 1000:.1f} ms, "
+                 f"parallelism {self.parallelism:.2f}x"]
+        for name in sorted(self.timings, key=self.timings.get, reverse=True):
+            begin, end = self.spans[name]
+            marker = '*' if name in self.critical_path else ' '
+            lines.append(f"{marker} {name:<32} {self.timings[name] * 1000:>9.1f} ms "
+                         f"[{begin * 1000:>8.1f} - {end * 1000:>8.1f}]")
+        if self.critical_path:
+            lines.append("Critical path: " + " -> ".join(self.critical_path))
+        return "\n".join(lines)
+
+class BuildGraph:
+    """Content-hashed dependency graph of pipeline steps"""
+    
+    def __init__(self, state_path, metrics=None):
+        """
+        Initialize build graph
+        
+        Args:
+            state_path (str): JSON file holding the fingerprints of the last run
+            metrics (MetricsHook): Receives a 'build' stage record per step
+                (optional, defaults to a no-op hook)
+        """
+        self.state_path = Path(state_path)
+        self.metrics = metrics if metrics is not None else NullMetricsHook()
+        self.steps = {}
+    
+    def add(self, name, func, deps=(), sources=(), outputs=(), version='1'):
+        """
+        Add a step; its dependencies must already be in the graph
+        
+        Args:
+            name (str): Unique step name
+            func (callable): Called with the values of `deps`, in order
+            deps (list): Names of the steps whose values func takes
+            sources (list or callable): Raw files the step reads
+            outputs (list): Files the step writes
+            version (str): Step code version
+        
+        Returns:
+            str: The step name
+        """
+        if name in self.steps:
+            raise ValueError(f"Duplicate build step '{name}'")
+        missing = [dep for dep in deps if dep not in self.steps]
+        if missing:
+            raise ValueError(f"Build step '{name}' depends on unknown steps {missing}")
+        self.steps[name] = BuildStep(name, func, list(deps), sources,
+                                     [Path(path) for path in outputs], str(version))
+        return name
+    
+    def _load_state(self):
+        if self.state_path.exists():
+            try:
+                state = json.loads(self.state_path.read_text())
+                if state.get('version') == STATE_VERSION:
+                    return state
+            except ValueError:
+                logger.warning("Ignoring unreadable build state %s", self.state_path)
+        return {'version': STATE_VERSION, 'sources': {}, 'steps': {}}
+    
+    def _save_state(self, state):
+        self.state_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.state_path.with_name(f".tmp-{os.getpid()}-{self.state_path.name}")
+        tmp_path.write_text(json.dumps(state, indent=1))
+        os.replace(tmp_path, self.state_path)
+    
+    @staticmethod
+    def _file_hash(path, block_size=1 << 20):
+        digest = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(block_size), b''):
+                digest.update(block)
+        return digest.hexdigest()
+    
+    def _source_digest(self, path, state):
+        """Content hash of a source file, re-hashed only when its size or mtime changed"""
+        stat = os.stat(path)
+        entry = state['sources'].get(str(path))
+        if entry is None or entry['size'] != stat.st_size or entry['mtime_ns'] != stat.st_mtime_ns:
+            entry = {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns,
+                     'sha256': self._file_hash(path)}
+            state['sources'][str(path)] = entry
+        return entry['sha256']
+    
+    @staticmethod
+    def value_digest(value):
+        """Content hash of a step value: frames by their rows, figures by their JSON"""
+        import pandas as pd
+        digest = hashlib.sha256()
+        if isinstance(value, pd.DataFrame):
+            digest.update(repr(list(zip(value.columns, map(str, value.dtypes)))).encode())
+            digest.update(pd.util.hash_pandas_object(value, index=False).to_numpy().tobytes())
+        elif hasattr(value, 'to_plotly_json'):
+            digest.update(value.to_json().encode())
+        elif isinstance(value, bytes):
+            digest.update(value)
+        else:
+            digest.update(repr(value).encode())
+        return digest.hexdigest()
+    
+    def _closure(self, targets):
+        """Steps needed for the targets, in dependency order"""
+        if targets is None:
+            return list(self.steps)
+        needed = set()
+        stack = list(targets)
+        while stack:
+            name = stack.pop()
+            if name not in needed:
+                needed.add(name)
+                stack.extend(self.steps[name].deps)
+        # Steps are added after their dependencies, so insertion order is topological
+        return [name for name in self.steps if name in needed]
+    
+    def _step_key(self, name, state, digests):
+        """Hash of a step's version, source contents and dependency digests"""
+        step = self.steps[name]
+        key = hashlib.sha256(f"{name}:{step.version}".encode())
+        sources = step.sources() if callable(step.sources) else step.sources
+        for path in sorted(map(str, sources)):
+            key.update(f"{path}:{self._source_digest(path, state)}".encode())
+        for dep in step.deps:
+            key.update(f"{dep}:{digests[dep]}".encode())
+        return key.hexdigest()
+    
+    def run(self, targets=None, force=False, workers=1, executor='thread'):
+        """
+        Bring the targets up to date
+        
+        A step is skipped when its code version, the content of its sources
+        and the content of its dependencies' values all match the last
+        successful run, and its outputs exist. A skipped step is still
+        computed if a dependent has to rerun and needs its value. When a
+        rerun step produces an unchanged value, its dependents stay skipped.
+        
+        Steps whose dependencies are available run concurrently on a pool of
+        `workers`. With the process executor, step functions and the values
+        passed between steps must be picklable.
+        
+        Args:
+            targets (list): Step names to build (optional, all steps when omitted)
+            force (bool): Rerun every step
+            workers (int): Steps run at once (1 runs them inline)
+            executor (str): 'thread' or 'process'
+        
+        Returns:
+            BuildReport: Built and skipped steps with per-step timings and the critical path
+        """
+        if executor not in EXECUTORS:
+            raise ValueError(f"Unknown executor '{executor}', expected one of {EXECUTORS}")
+        
+        start = time.perf_counter()
+        state = self._load_state()
+        previous = state['steps']
+        report = BuildReport()
+        undecided = self._closure(targets)
+        digests, values = {}, {}
+        wanted, running = set(), {}
+        
+        if workers <= 1:
+            pool = _InlineExecutor()
+        elif executor == 'process':
+            pool = ProcessPoolExecutor(max_workers=workers)
+        else:
+            pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='hydro-build')
+        
+        def submit_ready(name):
+            step = self.steps[name]
+            if (name in wanted and name not in values and name not in running.values()
+                    and all(dep in values for dep in step.deps)):
+                future = pool.submit(_timed_call, step.func, [values[dep] for dep in step.deps])
+                running[future] = name
+        
+        def want(name):
+            # A step that reruns needs the values of its dependencies, even skipped ones
+            if name not in wanted:
+                wanted.add(name)
+                for dep in self.steps[name].deps:
+                    if dep not in values:
+                        want(dep)
+                submit_ready(name)
+        
+        def finish(name, value, step_start, step_end):
+            step = self.steps[name]
+            values[name] = value
+            report.timings[name] = step_end - step_start
+            report.spans[name] = (step_start - start, step_end - start)
+            if name in report.skipped:
+                report.skipped.remove(name)
+            report.built.append(name)
+            if name not in digests:
+                key = self._step_key(name, state, digests)
+                # Nothing consumes an output step's value, so its key stands in for it
+                digests[name] = key if step.outputs else self.value_digest(value)
+                previous[name] = {'key': key, 'digest': digests[name]}
+            if self.metrics.enabled:
+                self.metrics.emit(StageMetrics(stage='build', name=name, duration_s=report.timings[name],
+                                               rows=value.shape[0] if hasattr(value, 'shape') else 0))
+            for dependent in wanted:
+                if name in self.steps[dependent].deps:
+                    submit_ready(dependent)
+        
+        try:
+            while undecided or running:
+                # Decide every step whose dependency digests are known
+                for name in [name for name in undecided
+                             if all(dep in digests for dep in self.steps[name].deps)]:
+                    undecided.remove(name)
+                    entry = previous.get(name)
+                    if (not force and entry is not None
+                            and entry['key'] == self._step_key(name, state, digests)
+                            and all(path.exists() for path in self.steps[name].outputs)):
+                        digests[name] = entry['digest']
+                        report.skipped.append(name)
+                        if self.metrics.enabled:
+                            self.metrics.emit(StageMetrics(stage='build', name=name, status='skipped'))
+                    else:
+                        want(name)
+                
+                if not running:
+                    continue
+                done, _ = wait(list(running), return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    finish(name, *future.result())
+        except BaseException:
+            for future in running:
+                future.cancel()
+            raise
+        finally:
+            pool.shutdown(wait=True)
+            # Steps that finished are recorded even if a later one failed
+            self._save_state(state)
+            report.duration_s = time.perf_counter() - start
+        
+        report.critical_path = self._critical_path(report)
+        logger.info(report.summary())
+        return report
+    
+    def _critical_path(self, report):
+        """Longest chain of built steps by duration, which bounds the parallel wall time"""
+        finish, previous = {}, {}
+        for name in self.steps:
+            if name not in report.timings:
+                continue
+            built_deps = [dep for dep in self.steps[name].deps if dep in finish]
+            before = max(built_deps, key=finish.get, default=None)
+            previous[name] = before
+            finish[name] = report.timings[name] + (finish[before] if before else 0.0)
+        
+        path = []
+        name = max(finish, key=finish.get, default=None)
+        while name is not None:
+            path.append(name)
+            name = previous[name]
+        return path[::-1]
+
+class _InlineExecutor:
+    """Executor that runs each call on submit, for single-worker builds"""
+    
+    def submit(self, func, *args):
+        future = Future()
+        try:
+            future.set_result(func(*args))
+        except BaseException as e:
+            future.set_exception(e)
+        return future
+    
+    def shutdown(self, wait=True):
+        pass
+
+def _timed_call(func, args):
+    """Run a step function, returning its value with start and end times"""
+    start = time.perf_counter()
+    value = func(*args)
+    return value, start, time.perf_counter()
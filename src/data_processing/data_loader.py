@@ -6,22 +6,147 @@ Provides utilities for loading, cleaning, and processing datasets
 import pandas as pd
 import numpy as np
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Optional
+import atexit
+import glob
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+import uuid
 import warnings
 warnings.filterwarnings('ignore')
 
+try:
+    from .build_graph import BuildGraph
+    from .frame_cache import FrameCache
+    from .metrics import NullMetricsHook, LoggingMetricsHook, StageMetrics, measure_stage
+except ImportError:
+    # Allow running this module directly as a script
+    from build_graph import BuildGraph
+    from frame_cache import FrameCache
+    from metrics import NullMetricsHook, LoggingMetricsHook, StageMetrics, measure_stage
+
+logger = logging.getLogger(__name__)
+
+try:
+    import pyarrow  # noqa: F401
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+# Declared column types for each raw dataset. Numerics are narrowed to 32-bit
+# (16-bit for the year) and label columns are parsed straight into categoricals.
+MARKET_SCHEMA = {
+    'year': 'int16',
+    'region': 'category',
+    'installed_capacity_mw': 'float32',
+    'generation_gwh': 'float32',
+    'market_value_million_usd': 'float32',
+    'investment_million_usd': 'float32',
+    'number_of_plants': 'int32',
+}
+
+COMPETITOR_SCHEMA = {
+    'company_name': 'string',
+    'market_share_percent': 'float32',
+    'installed_capacity_mw': 'float32',
+    'service_portfolio': 'string',
+    'geographic_presence': 'category',
+    'strength_score': 'float32',
+    'weakness_score': 'float32',
+    'opportunity_score': 'float32',
+    'threat_score': 'float32',
+}
+
+CUSTOMER_SCHEMA = {
+    'customer_type': 'category',
+    'size_category': 'category',
+    'annual_consumption_gwh': 'float32',
+    'decision_making_time_months': 'int32',
+    'budget_range_million_usd': 'string',
+    'primary_concerns': 'string',
+    'technology_preference': 'category',
+    'geographic_location': 'category',
+    'contract_duration_years': 'int32',
+}
+
+CSV_ENGINES = ('c', 'python', 'pyarrow')
+
+# Metrics summed per year in the market summary; all but the plant count also
+# get a year-over-year growth column
+SUMMARY_METRICS = [
+    'installed_capacity_mw',
+    'generation_gwh',
+    'market_value_million_usd',
+    'investment_million_usd',
+    'number_of_plants',
+]
+GROWTH_METRICS = SUMMARY_METRICS[:4]
+
+def sum_dtype(dtype):
+    """Dtype of a summed metric: int64 for integer columns so totals cannot wrap, else float64"""
+    return np.dtype('int64') if np.dtype(dtype).kind in 'iub' else np.dtype('float64')
+
+# Row count above which get_market_summary switches to the NumPy bincount kernel
+NUMPY_SUMMARY_MIN_ROWS = 10_000
+NUMPY_SUMMARY_BLOCK_ROWS = 1 << 16
+SUMMARY_METHODS = ('auto', 'pandas', 'numpy')
+
+# Rows per chunk when streaming or filtering a CSV during the parse
+CHUNK_ROWS = 1_000_000
+
+# Hive-style partition keys of the partitioned market layout, outermost first:
+# data/raw/market/year=2024/region=Southeast/part-*.csv
+MARKET_PARTITION_KEYS = ['year', 'region']
+
+# Compressed variants of a raw CSV that are picked up when the plain file is
+# absent, in order of preference; pandas decompresses them as a stream
+# (.zst needs the zstandard package)
+COMPRESSED_SUFFIXES = ('.zst', '.gz', '.xz')
+CSV_FILE_SUFFIXES = ('.csv',) + tuple(f'.csv{suffix}' for suffix in COMPRESSED_SUFFIXES)
+PARTITION_FILE_SUFFIXES = CSV_FILE_SUFFIXES + ('.parquet',)
+
+# Output formats of save_processed_data and the Parquet codec used by default
+PROCESSED_FORMATS = ('csv', 'parquet')
+DEFAULT_PARQUET_COMPRESSION = 'zstd'
+
+@dataclass
+class HydroDatasets:
+    """Bundle of the three raw datasets returned by HydroDataLoader.load_all"""
+    market: Optional[pd.DataFrame] = None
+    competitor: Optional[pd.DataFrame] = None
+    customer: Optional[pd.DataFrame] = None
+    timings: dict = field(default_factory=dict)
+
 class HydroDataLoader:
     """Data loader class for hydro energy sector analysis"""
     
-    def __init__(self, data_path=None):
+    def __init__(self, data_path=None, engine=None, use_cache=True,
+                 memory_budget=256 * 1024 ** 2, metrics=None):
         """
         Initialize data loader
         
         Args:
             data_path (str): Path to data directory (optional)
+            engine (str): CSV parser engine - 'c', 'python' or 'pyarrow'
+                (optional, defaults to the multithreaded 'pyarrow' reader when installed)
+            use_cache (bool): Keep a Parquet copy of each raw file under the
+                processed directory and read it instead of re-parsing the CSV
+                (requires pyarrow)
+            memory_budget (int): Byte budget for the in-process LRU cache of
+                loaded frames (0 disables it)
+            metrics (MetricsHook): Receives duration, rows, bytes and peak
+                allocation of every load, aggregate and save stage
+                (optional, defaults to a no-op hook)
         """
         if data_path is None:
             # Try to find the data directory relative to the project root
-            current_dir = Path(__file__).parent
+            current_dir = Path(__file__).resolve().parent
             # Go up to src, then up to project root, then to data
             project_root = current_dir.parent.parent
             data_path = project_root / "data"
@@ -30,111 +155,968 @@ class HydroDataLoader:
         self.raw_path = self.data_path / "raw"
         self.processed_path = self.data_path / "processed"
         
-    def load_market_data(self):
-        """Load Brazil hydro energy market data"""
+        if engine is None:
+            engine = 'pyarrow' if PYARROW_AVAILABLE else 'c'
+        if engine not in CSV_ENGINES:
+            raise ValueError(f"Unknown CSV engine '{engine}', expected one of {CSV_ENGINES}")
+        self.engine = engine
+        self.use_cache = use_cache and PYARROW_AVAILABLE
+        self.cache_path = self.processed_path / "cache"
+        self.market_partitions_path = self.raw_path / "market"
+        self.frame_cache = FrameCache(memory_budget)
+        self.metrics = metrics if metrics is not None else NullMetricsHook()
+        self._market_cube = None
+        self._market_cube_fingerprint = None
+        self._writer = None
+        self._pending_writes = []
+        self._writer_lock = threading.Lock()
+    
+    def _read_csv(self, path, schema, **kwargs):
+        """Parse a raw CSV with its declared schema using the configured engine"""
+        return pd.read_csv(path, dtype=schema, engine=self.engine, **kwargs)
+    
+    @staticmethod
+    def _file_hash(path, block_size=1 << 20):
+        """Compute the SHA-256 digest of a file"""
+        digest = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(block_size), b''):
+                digest.update(block)
+        return digest.hexdigest()
+    
+    def _cache_files(self, source):
+        """Return the (parquet, metadata) cache paths for a raw file"""
+        # Keyed on the full path so same-named files in different directories
+        # never share (and race on) one cache entry
+        source = Path(source).resolve()
+        name = f"{source.name.split('.')[0]}-{hashlib.sha1(str(source).encode()).hexdigest()[:16]}"
+        return self.cache_path / f"{name}.parquet", self.cache_path / f"{name}.meta.json"
+    
+    @staticmethod
+    def _replace_file(path, write):
+        """Call write on a temporary name next to path and rename it into place"""
+        tmp_path = path.with_name(f".tmp-{os.getpid()}-{threading.get_ident()}-{path.name}")
+        try:
+            write(tmp_path)
+            os.replace(tmp_path, path)
+        except BaseException:
+            tmp_path.unlink(missing_ok=True)
+            raise
+    
+    def _fresh_cache(self, source, schema):
+        """Return the cache file for a raw file, or None if it is missing or stale"""
+        stat = source.stat()
+        cache_file, meta_file = self._cache_files(source)
+        if not cache_file.exists() or not meta_file.exists():
+            return None
+        
+        meta = json.loads(meta_file.read_text())
+        if meta.get('source') != str(source):
+            # Another raw file with the same name stem owns this cache entry
+            return None
+        if meta.get('schema') != schema or meta.get('size') != stat.st_size:
+            return None
+        if meta.get('mtime_ns') != stat.st_mtime_ns:
+            # Touched but possibly unchanged - fall back to the content hash
+            if meta.get('sha256') != self._file_hash(source):
+                return None
+            meta['mtime_ns'] = stat.st_mtime_ns
+            self._replace_file(meta_file, lambda path: path.write_text(json.dumps(meta)))
+        
+        return cache_file
+    
+    def _write_cache(self, source, schema, df):
+        """
+        Write the Parquet copy of a raw file along with its fingerprint
+        
+        Both files are renamed into place, the Parquet file first, so a reader
+        never sees a partial file and a fingerprint always describes a
+        complete Parquet copy.
+        """
+        stat = source.stat()
+        cache_file, meta_file = self._cache_files(source)
         try:
-            df = pd.read_csv(self.raw_path / "brazil_hydro_data.csv")
-            print(f"Loaded market data: {df.shape[0]} records, {df.shape[1]} columns")
+            self.cache_path.mkdir(parents=True, exist_ok=True)
+            self._replace_file(cache_file, lambda path: df.to_parquet(path, index=False))
+            meta = {
+                'source': str(source),
+                'size': stat.st_size,
+                'mtime_ns': stat.st_mtime_ns,
+                'sha256': self._file_hash(source),
+                'schema': schema,
+            }
+            self._replace_file(meta_file, lambda path: path.write_text(json.dumps(meta)))
+        except OSError as e:
+            logger.warning("Error writing cache for %s: %s", source.name, e)
+    
+    @staticmethod
+    def _apply_filters(df, filters, columns=None):
+        """Keep the rows matching every {column: allowed values} filter, then project"""
+        if filters:
+            mask = np.ones(len(df), dtype=bool)
+            for col, values in filters.items():
+                mask &= df[col].isin(values).to_numpy()
+            df = df[mask]
+        if columns is not None:
+            df = df[columns]
+        return df.reset_index(drop=True)
+    
+    def _read_csv_filtered(self, source, schema, columns, filters):
+        """Parse a CSV in chunks, dropping filtered-out rows as each chunk is read"""
+        read_cols = list(columns) if columns is not None else list(schema)
+        read_cols += [col for col in filters if col not in read_cols]
+        # The pyarrow reader does not support chunked iteration
+        engine = 'c' if self.engine == 'pyarrow' else self.engine
+        parts = []
+        with pd.read_csv(source, dtype={c: schema[c] for c in read_cols}, usecols=read_cols,
+                         engine=engine, chunksize=CHUNK_ROWS) as reader:
+            for chunk in reader:
+                parts.append(self._apply_filters(chunk, filters, columns))
+        
+        df = pd.concat(parts, ignore_index=True)
+        # Chunks carry their own categories, so concatenation may fall back to object
+        categories = [c for c in df.columns if schema[c] == 'category' and df[c].dtype != 'category']
+        return df.astype({c: 'category' for c in categories})
+    
+    def _resolve_source(self, filename):
+        """
+        Return the raw file for a dataset, falling back to a compressed variant
+        
+        Args:
+            filename (str): File name under the raw directory, e.g. "customer_data.csv"
+        
+        Raises:
+            FileNotFoundError: If neither the file nor a compressed variant exists
+        """
+        source = self.raw_path / filename
+        if source.exists():
+            return source
+        for suffix in COMPRESSED_SUFFIXES:
+            candidate = source.with_name(source.name + suffix)
+            if candidate.exists():
+                return candidate
+        raise FileNotFoundError(source)
+    
+    def _load_raw(self, filename, schema, columns=None, filters=None, record=None):
+        """
+        Load a raw dataset, serving repeated loads from the in-process frame cache
+        
+        Args:
+            filename (str): File name under the raw directory
+            schema (dict): Declared column types
+            columns (list): Columns to return (optional, all when omitted)
+            filters (dict): {column: allowed values} row filters (optional)
+            record (StageMetrics): Stage record to report bytes read to (optional)
+        """
+        source = self._resolve_source(filename)
+        stat = source.stat()
+        key = (
+            str(source), stat.st_size, stat.st_mtime_ns,
+            tuple(columns) if columns is not None else None,
+            tuple(sorted((col, tuple(values)) for col, values in (filters or {}).items())),
+        )
+        df = self.frame_cache.get(key)
+        if df is None:
+            df = self._read_dataset(source, schema, columns, filters, record)
+            self.frame_cache.put(key, df)
+        elif record is not None:
+            record.extra['source'] = 'memory'
+        return df
+    
+    def _read_dataset(self, source, schema, columns=None, filters=None, record=None):
+        """
+        Read a raw dataset from disk, going through the columnar cache when enabled
+        
+        Args:
+            source (Path): Resolved raw file, as returned by _resolve_source or _resolve_files
+            schema (dict): Declared column types
+            columns (list): Columns to return (optional, all when omitted)
+            filters (dict): {column: allowed values} row filters (optional)
+            record (StageMetrics): Stage record to report bytes read to (optional)
+        """
+        filters = {col: list(values) for col, values in (filters or {}).items()}
+        if record is None:
+            record = StageMetrics(stage='', name='')
+        if self.use_cache:
+            cache_file = self._fresh_cache(source, schema)
+            if cache_file is not None:
+                record.bytes_read = cache_file.stat().st_size
+                record.extra['source'] = 'parquet'
+                # Parquet reads only the requested column chunks and skips row groups
+                parquet_filters = [(col, 'in', values) for col, values in filters.items()]
+                df = pd.read_parquet(cache_file, columns=columns, filters=parquet_filters or None)
+                return df.reset_index(drop=True)
+            
+            # Populate the cache with the full file, then filter in memory
+            record.bytes_read = source.stat().st_size
+            record.extra['source'] = 'csv'
+            df = self._read_csv(source, schema)
+            self._write_cache(source, schema, df)
+            return self._apply_filters(df, filters, columns)
+        
+        record.bytes_read = source.stat().st_size
+        record.extra['source'] = 'csv'
+        if filters:
+            return self._read_csv_filtered(source, schema, columns, filters)
+        return self._read_csv(source, schema, usecols=columns)
+        
+    @property
+    def market_is_partitioned(self):
+        """True when market data is stored in the hive-partitioned directory layout"""
+        return self.market_partitions_path.is_dir()
+    
+    @staticmethod
+    def _partition_value(schema, key, raw):
+        """Convert a partition directory value to its declared column type"""
+        return int(raw) if schema[key].startswith('int') else raw
+    
+    def _discover_partitions(self, root, schema, filters=None):
+        """
+        Walk a hive-style directory tree, pruning directories that fail the filters
+        
+        Args:
+            root (Path): Root of the partitioned dataset
+            schema (dict): Declared column types
+            filters (dict): {column: allowed values} filters (optional)
+        
+        Returns:
+            list: (file path, {partition key: value}) for every surviving data file
+        """
+        filters = filters or {}
+        files = []
+        
+        def walk(directory, partition):
+            for entry in sorted(directory.iterdir()):
+                if entry.is_dir() and '=' in entry.name:
+                    key, raw = entry.name.split('=', 1)
+                    value = self._partition_value(schema, key, raw)
+                    if key in filters and value not in filters[key]:
+                        continue
+                    walk(entry, {**partition, key: value})
+                elif (entry.is_file() and entry.name.endswith(PARTITION_FILE_SUFFIXES)
+                        and not entry.name.startswith('.')):
+                    # Dot files are writes still in progress
+                    files.append((entry, partition))
+        
+        walk(root, {})
+        return files
+    
+    def _read_partition_file(self, path, schema, columns, chunksize=None):
+        """Read one partition file, yielding it whole or in chunks"""
+        if path.suffix == '.parquet':
+            yield pd.read_parquet(path, columns=columns)
+        elif chunksize:
+            engine = 'c' if self.engine == 'pyarrow' else self.engine
+            with pd.read_csv(path, dtype=schema, usecols=columns, engine=engine,
+                             chunksize=chunksize) as reader:
+                yield from reader
+        else:
+            yield self._read_csv(path, schema, usecols=columns)
+    
+    def _iter_partitions(self, root, schema, columns=None, filters=None, chunksize=None):
+        """Yield frames from the surviving partitions with partition columns restored"""
+        filters = filters or {}
+        columns = list(columns) if columns is not None else list(schema)
+        for path, partition in self._discover_partitions(root, schema, filters):
+            file_columns = [c for c in columns + list(filters) if c not in partition]
+            file_columns = list(dict.fromkeys(file_columns))
+            file_schema = {c: schema[c] for c in file_columns}
+            for df in self._read_partition_file(path, file_schema, file_columns, chunksize):
+                for key, value in partition.items():
+                    if key in columns:
+                        df[key] = value
+                remaining = {k: v for k, v in filters.items() if k not in partition}
+                yield self._apply_filters(df, remaining, columns)
+    
+    def _load_partitioned(self, root, schema, columns=None, filters=None, record=None):
+        """Load a hive-partitioned dataset, opening only the partitions that match the filters"""
+        if record is None:
+            record = StageMetrics(stage='', name='')
+        columns = list(columns) if columns is not None else list(schema)
+        files = self._discover_partitions(root, schema, filters)
+        key = (
+            str(root),
+            tuple((str(path), path.stat().st_size, path.stat().st_mtime_ns) for path, _ in files),
+            tuple(columns),
+            tuple(sorted((col, tuple(values)) for col, values in (filters or {}).items())),
+        )
+        df = self.frame_cache.get(key)
+        if df is not None:
+            record.extra['source'] = 'memory'
             return df
+        
+        record.bytes_read = sum(size for _, size, _ in key[1])
+        record.extra['source'] = 'partitions'
+        record.extra['files'] = len(files)
+        parts = list(self._iter_partitions(root, schema, columns, filters))
+        if parts:
+            df = pd.concat(parts, ignore_index=True)
+        else:
+            df = pd.DataFrame(columns=columns)
+        df = df.astype({c: schema[c] for c in columns})
+        self.frame_cache.put(key, df)
+        return df
+    
+    def market_source_files(self):
+        """Return the raw files load_market_data reads by default (empty when there are none)"""
+        if self.market_is_partitioned:
+            return [path for path, _ in self._discover_partitions(self.market_partitions_path, MARKET_SCHEMA)]
+        try:
+            return [self._resolve_source("brazil_hydro_data.csv")]
         except FileNotFoundError:
-            print("Market data file not found")
+            return []
+    
+    def available_market_years(self):
+        """Return the sorted list of years present in the market data"""
+        if self.market_is_partitioned:
+            return sorted({
+                self._partition_value(MARKET_SCHEMA, 'year', entry.name.split('=', 1)[1])
+                for entry in self.market_partitions_path.glob('year=*') if entry.is_dir()
+            })
+        df = self.load_market_data(columns=['year'])
+        if df is None:
+            return []
+        return sorted(int(year) for year in df['year'].unique())
+    
+    def write_market_partitions(self, df, basename=None):
+        """
+        Write market rows into the hive-partitioned layout, one file per (year, region)
+        
+        Appending a new year only creates new partition directories; existing
+        partitions are untouched unless a file with the same basename is rewritten.
+        Each file is written under a temporary name and renamed into place.
+        
+        Args:
+            df (pd.DataFrame): Market rows to write
+            basename (str): File name stem within each partition (optional,
+                defaults to a unique name per call)
+        
+        Returns:
+            list: Paths of the written files
+        """
+        if basename is None:
+            basename = f"part-{uuid.uuid4().hex}"
+        
+        with measure_stage(self.metrics, 'save', 'market_partitions') as record:
+            written = self._write_market_partitions(df, basename)
+            record.rows = len(df)
+            record.bytes_written = sum(path.stat().st_size for path in written)
+        logger.info("Wrote %d market partitions under %s", len(written), self.market_partitions_path)
+        return written
+    
+    def _write_market_partitions(self, df, basename):
+        """Write one CSV per (year, region) group and return their paths"""
+        written = []
+        for values, group in df.groupby(MARKET_PARTITION_KEYS, observed=True):
+            directory = self.market_partitions_path
+            for key, value in zip(MARKET_PARTITION_KEYS, values):
+                directory = directory / f"{key}={value}"
+            directory.mkdir(parents=True, exist_ok=True)
+            path = directory / f"{basename}.csv"
+            data = group.drop(columns=MARKET_PARTITION_KEYS)
+            self._replace_file(path, lambda tmp_path: data.to_csv(tmp_path, index=False))
+            written.append(path)
+        return written
+    
+    def _resolve_files(self, files):
+        """Expand a glob pattern or list of paths (relative to the raw directory) to absolute files"""
+        if isinstance(files, (str, Path)):
+            pattern = Path(files)
+            if not pattern.is_absolute():
+                pattern = self.raw_path / pattern
+            if glob.has_magic(str(pattern)):
+                paths = [Path(p) for p in sorted(glob.glob(str(pattern)))]
+            else:
+                paths = [pattern]
+        else:
+            paths = [Path(f) if Path(f).is_absolute() else self.raw_path / f for f in files]
+        
+        if not paths:
+            raise FileNotFoundError(f"No files match {files}")
+        for path in paths:
+            if not path.is_file():
+                raise FileNotFoundError(path)
+        # Absolute paths are handed to _read_dataset and the parser processes
+        # as is, so they do not depend on the working directory
+        return [path.resolve() for path in paths]
+    
+    @staticmethod
+    def _concat_typed(parts, schema):
+        """
+        Concatenate typed frames in a single allocation per column
+        
+        Each file yields its own categories, which would make pd.concat fall
+        back to object columns; aligning every part to the union of categories
+        first keeps the categorical dtype and avoids a second conversion pass.
+        """
+        categorical = [c for c in parts[0].columns if schema.get(c) == 'category']
+        for col in categorical:
+            # Built from the category values rather than union_categoricals, which
+            # rejects parts whose categories differ in dtype (an empty part read
+            # from Parquet has object categories)
+            categories = np.concatenate([
+                np.asarray(part[col].astype('category').cat.categories, dtype=object) for part in parts
+            ])
+            dtype = pd.CategoricalDtype(pd.Index(categories).unique().sort_values())
+            parts = [part.assign(**{col: part[col].astype(dtype)}) for part in parts]
+        return pd.concat(parts, ignore_index=True)
+    
+    def _load_files(self, paths, schema, columns=None, filters=None, workers=None,
+                    provenance=False, record=None):
+        """
+        Load and concatenate several raw files, parsing them on a process pool
+        
+        Args:
+            paths (list): Files to read
+            schema (dict): Declared column types
+            columns (list): Columns to return (optional, all when omitted)
+            filters (dict): {column: allowed values} row filters (optional)
+            workers (int): Parser processes (optional, defaults to one per file up to the CPU count)
+            provenance (bool): Add a categorical source_file column naming each row's file
+            record (StageMetrics): Stage record to report bytes read to (optional)
+        """
+        if record is None:
+            record = StageMetrics(stage='', name='')
+        stats = [path.stat() for path in paths]
+        key = (
+            tuple((str(path), st.st_size, st.st_mtime_ns) for path, st in zip(paths, stats)),
+            tuple(columns) if columns is not None else None,
+            tuple(sorted((col, tuple(values)) for col, values in (filters or {}).items())),
+            provenance,
+        )
+        df = self.frame_cache.get(key)
+        if df is not None:
+            record.extra['source'] = 'memory'
+            return df
+        
+        record.bytes_read = sum(st.st_size for st in stats)
+        record.extra['source'] = 'files'
+        record.extra['files'] = len(paths)
+        
+        if workers is None:
+            workers = min(len(paths), os.cpu_count() or 1)
+        if workers > 1 and len(paths) > 1:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                futures = [
+                    pool.submit(_parse_file_worker, path, schema, columns, filters,
+                                self.engine, self.use_cache, self.data_path)
+                    for path in paths
+                ]
+                parts = [future.result() for future in futures]
+        else:
+            parts = [self._read_dataset(path, schema, columns, filters) for path in paths]
+        
+        if provenance:
+            names = pd.CategoricalDtype([path.name for path in paths])
+            parts = [
+                part.assign(source_file=pd.Categorical([path.name] * len(part), dtype=names))
+                for path, part in zip(paths, parts)
+            ]
+        df = self._concat_typed(parts, schema)
+        self.frame_cache.put(key, df)
+        return df
+    
+    def load_market_data(self, columns=None, years=None, regions=None, files=None,
+                         workers=None, provenance=False):
+        """
+        Load Brazil hydro energy market data
+        
+        Reads the given files when provided, else the partitioned layout under
+        raw/market when it exists, otherwise brazil_hydro_data.csv.
+        
+        Args:
+            columns (list): Columns to read (optional, all when omitted)
+            years (int or list): Only keep rows for these years (optional)
+            regions (list): Only keep rows for these regions (optional)
+            files (str or list): Glob pattern or list of market files, relative
+                to the raw directory unless absolute, e.g. "market_*.csv" (optional)
+            workers (int): Parser processes for multi-file loads (optional)
+            provenance (bool): Add a source_file column for multi-file loads
+        """
+        filters = {}
+        if years is not None:
+            filters['year'] = [years] if np.isscalar(years) else list(years)
+        if regions is not None:
+            filters['region'] = [regions] if isinstance(regions, str) else list(regions)
+        
+        try:
+            with measure_stage(self.metrics, 'load', 'market') as record:
+                if files is not None:
+                    df = self._load_files(self._resolve_files(files), MARKET_SCHEMA,
+                                          columns=columns, filters=filters, workers=workers,
+                                          provenance=provenance, record=record)
+                elif self.market_is_partitioned:
+                    df = self._load_partitioned(self.market_partitions_path, MARKET_SCHEMA,
+                                                columns=columns, filters=filters, record=record)
+                else:
+                    df = self._load_raw("brazil_hydro_data.csv", MARKET_SCHEMA,
+                                        columns=columns, filters=filters, record=record)
+                record.rows = len(df)
+            return df
+        except FileNotFoundError:
+            logger.warning("Market data file not found")
             return None
     
     def load_competitor_data(self):
         """Load competitor analysis data"""
         try:
-            df = pd.read_csv(self.raw_path / "competitor_data.csv")
-            print(f"Loaded competitor data: {df.shape[0]} records, {df.shape[1]} columns")
+            with measure_stage(self.metrics, 'load', 'competitor') as record:
+                df = self._load_raw("competitor_data.csv", COMPETITOR_SCHEMA, record=record)
+                record.rows = len(df)
             return df
         except FileNotFoundError:
-            print("Competitor data file not found")
+            logger.warning("Competitor data file not found")
             return None
     
     def load_customer_data(self):
         """Load customer segmentation data"""
         try:
-            df = pd.read_csv(self.raw_path / "customer_data.csv")
-            print(f"Loaded customer data: {df.shape[0]} records, {df.shape[1]} columns")
+            with measure_stage(self.metrics, 'load', 'customer') as record:
+                df = self._load_raw("customer_data.csv", CUSTOMER_SCHEMA, record=record)
+                record.rows = len(df)
             return df
         except FileNotFoundError:
-            print("Customer data file not found")
+            logger.warning("Customer data file not found")
             return None
     
-    def get_market_summary(self, df=None):
-        """Generate market summary statistics"""
-        if df is None:
+    def iter_market_chunks(self, chunksize=CHUNK_ROWS, columns=None):
+        """
+        Stream the market data CSV in fixed-size chunks
+        
+        Args:
+            chunksize (int): Number of rows per chunk
+            columns (list): Subset of columns to parse (optional)
+        
+        Yields:
+            pd.DataFrame: Consecutive chunks of the market data
+        """
+        if self.market_is_partitioned:
+            yield from self._iter_partitions(self.market_partitions_path, MARKET_SCHEMA,
+                                             columns=columns, chunksize=chunksize)
+            return
+        
+        try:
+            source = self._resolve_source("brazil_hydro_data.csv")
+        except FileNotFoundError:
+            logger.warning("Market data file not found")
+            return
+        
+        schema = MARKET_SCHEMA if columns is None else {c: MARKET_SCHEMA[c] for c in columns}
+        # The pyarrow reader does not support chunked iteration
+        engine = 'c' if self.engine == 'pyarrow' else self.engine
+        with pd.read_csv(source, dtype=schema, usecols=columns, engine=engine,
+                         chunksize=chunksize) as reader:
+            for chunk in reader:
+                yield chunk
+    
+    @staticmethod
+    def _add_growth_rates(summary):
+        """Append year-over-year growth columns to a per-year summary"""
+        for col in GROWTH_METRICS:
+            summary[f'{col}_growth_pct'] = summary[col].pct_change() * 100
+        return summary
+    
+    def _stream_market_summary(self, chunksize):
+        """Fold per-year metric sums chunk by chunk without materializing the file"""
+        totals = None
+        with measure_stage(self.metrics, 'aggregate', 'market_summary_stream') as record:
+            for chunk in self.iter_market_chunks(chunksize, columns=['year'] + SUMMARY_METRICS):
+                record.rows += len(chunk)
+                # Accumulate in float64 so long streams do not lose float32 precision
+                part = chunk.groupby('year')[SUMMARY_METRICS].sum().astype('float64')
+                totals = part if totals is None else totals.add(part, fill_value=0)
+        
+        if totals is None:
+            return None
+        summary = totals.sort_index().reset_index()
+        summary['number_of_plants'] = summary['number_of_plants'].astype('int64')
+        return self._add_growth_rates(summary)
+    
+    def cache_stats(self):
+        """Return hit/miss counters and memory use of the in-process frame cache"""
+        return self.frame_cache.stats()
+    
+    def load_all(self, max_workers=3):
+        """
+        Load market, competitor and customer data concurrently
+        
+        Args:
+            max_workers (int): Number of loader threads
+        
+        Returns:
+            HydroDatasets: The loaded frames plus per-file load time in seconds
+        """
+        loaders = {
+            'market': self.load_market_data,
+            'competitor': self.load_competitor_data,
+            'customer': self.load_customer_data,
+        }
+        
+        def timed(load):
+            start = time.perf_counter()
+            df = load()
+            return df, time.perf_counter() - start
+        
+        datasets = HydroDatasets()
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            futures = {name: pool.submit(timed, load) for name, load in loaders.items()}
+            for name, future in futures.items():
+                df, elapsed = future.result()
+                setattr(datasets, name, df)
+                datasets.timings[name] = elapsed
+        return datasets
+    
+    @staticmethod
+    def _year_codes(years):
+        """
+        Map the year column to dense integer codes
+        
+        Integer years are offset by their minimum, which is much cheaper than a
+        hash-based factorize; anything else falls back to pd.factorize.
+        
+        Returns:
+            tuple: (codes as intp, year value for each code)
+        """
+        values = years.to_numpy()
+        if values.dtype.kind in 'iu' and len(values):
+            low, high = int(values.min()), int(values.max())
+            if high - low < 1_000_000:
+                codes = values.astype(np.intp) - low
+                return codes, np.arange(low, high + 1).astype(values.dtype)
+        
+        codes, labels = pd.factorize(years, sort=True)
+        return codes, np.asarray(labels)
+    
+    @classmethod
+    def _sum_by_year_numpy(cls, df, block_rows=NUMPY_SUMMARY_BLOCK_ROWS):
+        """
+        Per-year metric sums using a single encoding of the year column
+        
+        Produces the same frame as the pandas groupby path, but sums every
+        metric with np.bincount over the shared year codes, skipping groupby
+        setup and the dict-of-aggregations dispatch. Rows are processed in
+        cache-sized blocks so bincount's float64 cast of each block stays hot.
+        """
+        codes, years = cls._year_codes(df['year'])
+        valid = codes >= 0
+        if not valid.all():
+            codes = codes[valid]
+            df = df[valid]
+        
+        n_years = len(years)
+        columns = [df[col].to_numpy() for col in SUMMARY_METRICS]
+        sums = np.zeros((len(SUMMARY_METRICS), n_years))
+        counts = np.zeros(n_years, dtype=np.int64)
+        for start in range(0, len(codes), block_rows):
+            block = codes[start:start + block_rows]
+            counts += np.bincount(block, minlength=n_years)
+            for i, values in enumerate(columns):
+                values = values[start:start + block_rows]
+                if values.dtype.kind == 'f' and np.isnan(values).any():
+                    values = np.nan_to_num(values)
+                sums[i] += np.bincount(block, weights=values, minlength=n_years)
+        
+        # Drop codes with no rows; totals are widened rather than cast back to
+        # each column's dtype, which would wrap large int32 sums
+        present = counts > 0
+        summary = {'year': years[present]}
+        for i, col in enumerate(SUMMARY_METRICS):
+            summary[col] = sums[i, present].astype(sum_dtype(df[col].dtype))
+        return pd.DataFrame(summary)
+    
+    def _market_fingerprint(self):
+        """Return (path, size, mtime) for every market source file"""
+        if self.market_is_partitioned:
+            files = [path for path, _ in self._discover_partitions(self.market_partitions_path, MARKET_SCHEMA)]
+        else:
+            files = [self._resolve_source("brazil_hydro_data.csv")]
+        return tuple((str(path), path.stat().st_size, path.stat().st_mtime_ns) for path in files)
+    
+    def get_market_cube(self):
+        """
+        Return the year x region aggregate cube of the market data
+        
+        The cube is built once and reused until a market source file changes.
+        
+        Returns:
+            MarketCube: Precomputed totals, or None if no market data is available
+        """
+        try:
+            from .market_cube import MarketCube
+        except ImportError:
+            from market_cube import MarketCube
+        
+        try:
+            fingerprint = self._market_fingerprint()
+        except FileNotFoundError:
+            logger.warning("Market data file not found")
+            return None
+        
+        if self._market_cube is None or fingerprint != self._market_cube_fingerprint:
             df = self.load_market_data()
+            if df is None:
+                return None
+            with measure_stage(self.metrics, 'aggregate', 'market_cube') as record:
+                self._market_cube = MarketCube(df)
+                record.rows = len(df)
+            self._market_cube_fingerprint = fingerprint
+        return self._market_cube
+    
+    def get_market_summary(self, df=None, chunksize=None, method='auto'):
+        """
+        Generate market summary statistics
+        
+        When no frame is given the summary is read from the market cube.
+        
+        Args:
+            df (pd.DataFrame): Market data (optional, loaded when omitted)
+            chunksize (int): When set and no frame is given, stream the raw
+                file in chunks of this many rows with constant memory
+            method (str): Aggregation kernel - 'pandas' groupby, 'numpy'
+                bincount, or 'auto' to use NumPy above NUMPY_SUMMARY_MIN_ROWS rows
+        """
+        if method not in SUMMARY_METHODS:
+            raise ValueError(f"Unknown summary method '{method}', expected one of {SUMMARY_METHODS}")
+        
+        if df is None and chunksize:
+            return self._stream_market_summary(chunksize)
+        
+        if df is None:
+            cube = self.get_market_cube()
+            return cube.market_summary() if cube is not None else None
         
         if df is not None:
-            summary = df.groupby('year').agg({
-                'installed_capacity_mw': 'sum',
-                'generation_gwh': 'sum',
-                'market_value_million_usd': 'sum',
-                'investment_million_usd': 'sum',
-                'number_of_plants': 'sum'
-            }).reset_index()
-            
-            # Calculate growth rates
-            for col in ['installed_capacity_mw', 'generation_gwh', 'market_value_million_usd', 'investment_million_usd']:
-                summary[f'{col}_growth_pct'] = summary[col].pct_change() * 100
+            if method == 'auto':
+                method = 'numpy' if len(df) >= NUMPY_SUMMARY_MIN_ROWS else 'pandas'
             
+            with measure_stage(self.metrics, 'aggregate', 'market_summary') as record:
+                if method == 'numpy':
+                    summary = self._sum_by_year_numpy(df)
+                else:
+                    summary = df.groupby('year').agg(
+                        {col: 'sum' for col in SUMMARY_METRICS}
+                    ).reset_index()
+                    # Same totals dtypes as the NumPy and streaming paths
+                    summary = summary.astype({col: sum_dtype(df[col].dtype) for col in SUMMARY_METRICS})
+                
+                # Calculate growth rates
+                summary = self._add_growth_rates(summary)
+                record.rows = len(df)
+                record.extra['method'] = method
             return summary
         return None
     
-    def get_regional_analysis(self, df=None):
-        """Generate regional market analysis"""
+    def get_incremental_summary(self, filename="market_summary_state.csv"):
+        """
+        Open the persisted incremental market summary, building it on first use
+        
+        Args:
+            filename (str): State file under the processed directory
+        
+        Returns:
+            IncrementalMarketSummary: Summary that can be updated from new rows
+        """
+        try:
+            from .market_summary import IncrementalMarketSummary
+        except ImportError:
+            from market_summary import IncrementalMarketSummary
+        
+        summary = IncrementalMarketSummary(self.processed_path / filename)
+        if len(summary) == 0:
+            df = self.load_market_data(columns=['year'] + SUMMARY_METRICS)
+            if df is None:
+                return None
+            summary.update(df, mode='replace')
+            summary.save()
+        return summary
+    
+    def get_regional_analysis(self, df=None, year=None):
+        """
+        Generate regional market analysis
+        
+        When no frame is given the analysis is one row per region. With the
+        partitioned layout only the partitions of the analysed year are read;
+        otherwise it comes from the market cube.
+        
+        Args:
+            df (pd.DataFrame): Market data (optional)
+            year (int): Year to analyse when no frame is given (optional,
+                defaults to the latest year)
+        """
+        if df is None and self.market_is_partitioned:
+            return self._pruned_regional_analysis(year)
+        
         if df is None:
-            df = self.load_market_data()
+            cube = self.get_market_cube()
+            return cube.regional_analysis(year) if cube is not None else None
         
         if df is not None:
-            latest_year = df['year'].max()
-            regional_analysis = df[df['year'] == latest_year].copy()
-            
-            # Calculate market shares
-            total_capacity = regional_analysis['installed_capacity_mw'].sum()
-            total_value = regional_analysis['market_value_million_usd'].sum()
-            
-            regional_analysis['capacity_share_pct'] = (regional_analysis['installed_capacity_mw'] / total_capacity) * 100
-            regional_analysis['value_share_pct'] = (regional_analysis['market_value_million_usd'] / total_value) * 100
+            with measure_stage(self.metrics, 'aggregate', 'regional_analysis') as record:
+                latest_year = df['year'].max()
+                regional_analysis = df[df['year'] == latest_year].copy()
+                
+                # Calculate market shares
+                total_capacity = regional_analysis['installed_capacity_mw'].sum()
+                total_value = regional_analysis['market_value_million_usd'].sum()
+                
+                regional_analysis['capacity_share_pct'] = (regional_analysis['installed_capacity_mw'] / total_capacity) * 100
+                regional_analysis['value_share_pct'] = (regional_analysis['market_value_million_usd'] / total_value) * 100
+                record.rows = len(df)
             
             return regional_analysis
         return None
     
-    def save_processed_data(self, data, filename):
-        """Save processed data to processed directory"""
+    def _pruned_regional_analysis(self, year=None):
+        """Regional analysis from one year's partitions, without scanning the whole tree"""
         try:
-            output_path = self.processed_path / filename
-            data.to_csv(output_path, index=False)
-            print(f"Saved processed data: {output_path}")
+            from .market_cube import MarketCube
+        except ImportError:
+            from market_cube import MarketCube
+        
+        if year is None:
+            years = self.available_market_years()
+            if not years:
+                return None
+            year = years[-1]
+        df = self.load_market_data(years=year)
+        if df is None or df.empty:
+            return None
+        with measure_stage(self.metrics, 'aggregate', 'regional_analysis') as record:
+            regional_analysis = MarketCube(df).regional_analysis(year)
+            record.rows = len(df)
+        return regional_analysis
+    
+    def save_processed_data(self, data, filename, format=None, compression=None, background=False):
+        """
+        Save processed data to processed directory
+        
+        The file is written under a temporary name and renamed into place, so
+        readers never see a partially written output.
+        
+        Args:
+            data (pd.DataFrame): Frame to save
+            filename (str): Output file name within the processed directory
+            format (str): 'csv' or 'parquet' (optional, inferred from the
+                file name and defaulting to CSV)
+            compression (str): Codec, e.g. 'zstd' or 'snappy' for Parquet and
+                'gzip' for CSV (optional, defaults to zstd for Parquet and to
+                the file name suffix for CSV)
+            background (bool): Write on the loader's writer thread and return
+                immediately; the frame must not be modified until the write
+                completes
+        
+        Returns:
+            Path or Future: The written path, or a future resolving to it
+        """
+        if format is None:
+            format = 'parquet' if str(filename).endswith('.parquet') else 'csv'
+        if format not in PROCESSED_FORMATS:
+            raise ValueError(f"Unknown output format '{format}', expected one of {PROCESSED_FORMATS}")
+        if format == 'parquet' and compression is None:
+            compression = DEFAULT_PARQUET_COMPRESSION
+        output_path = self.processed_path / filename
+        
+        if not background:
+            return self._write_processed(data, output_path, format, compression)
+        
+        with self._writer_lock:
+            if self._writer is None:
+                # A single writer keeps saves to the same file in submission order
+                self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix='hydro-writer')
+                atexit.register(self._flush_at_exit)
+            future = self._writer.submit(self._write_processed, data, output_path, format, compression)
+            self._pending_writes.append(future)
+        return future
+    
+    def _write_processed(self, data, output_path, format, compression):
+        """Write one processed frame to a temporary file and rename it into place"""
+        # The temporary name keeps the suffix so CSV compression can be inferred from it
+        tmp_path = output_path.with_name(f".tmp-{os.getpid()}-{threading.get_ident()}-{output_path.name}")
+        try:
+            with measure_stage(self.metrics, 'save', output_path.name) as record:
+                output_path.parent.mkdir(parents=True, exist_ok=True)
+                if format == 'parquet':
+                    data.to_parquet(tmp_path, index=False, compression=compression)
+                else:
+                    data.to_csv(tmp_path, index=False, compression=compression or 'infer')
+                os.replace(tmp_path, output_path)
+                record.rows = len(data)
+                record.bytes_written = output_path.stat().st_size
         except Exception as e:
-            print(f"Error saving data: {e}")
+            logger.error("Error saving %s: %s", output_path.name, e)
+            tmp_path.unlink(missing_ok=True)
+            raise
+        logger.info("Saved processed data: %s", output_path)
+        return output_path
+    
+    def flush(self):
+        """
+        Wait for every pending background write
+        
+        Returns:
+            list: Paths written since the last flush
+        
+        Raises:
+            Exception: The first write error, once all writes have finished
+        """
+        with self._writer_lock:
+            pending, self._pending_writes = self._pending_writes, []
+        
+        written, errors = [], []
+        for future in pending:
+            try:
+                written.append(future.result())
+            except Exception as e:
+                errors.append(e)
+        if errors:
+            raise errors[0]
+        return written
+    
+    def _flush_at_exit(self):
+        """Finish pending writes at interpreter exit; errors were already logged"""
+        try:
+            self.flush()
+        except Exception:
+            pass
+
+def _parse_file_worker(path, schema, columns, filters, engine, use_cache, data_path):
+    """Parse one raw file in a worker process"""
+    loader = HydroDataLoader(data_path, engine=engine, use_cache=use_cache, memory_budget=0)
+    return loader._read_dataset(path, schema, columns, filters)
+
+def add_market_steps(graph, loader):
+    """Add the raw market data -> market summary and regional analysis steps to a build graph"""
+    graph.add('market_data', loader.load_market_data, sources=loader.market_source_files)
+    graph.add('market_summary', loader.get_market_summary, deps=['market_data'])
+    graph.add('regional_analysis', loader.get_regional_analysis, deps=['market_data'])
 
 def main():
     """Example usage of the data loader"""
-    loader = HydroDataLoader()
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    loader = HydroDataLoader(metrics=LoggingMetricsHook())
     
-    # Load all datasets
-    market_data = loader.load_market_data()
-    competitor_data = loader.load_competitor_data()
-    customer_data = loader.load_customer_data()
+    if not loader.market_source_files():
+        print("No market data available. Please check data files.")
+        return
     
-    # Generate summaries
-    if market_data is not None:
-        market_summary = loader.get_market_summary(market_data)
-        regional_analysis = loader.get_regional_analysis(market_data)
-        
-        # Save processed data
-        loader.save_processed_data(market_summary, "market_summary.csv")
-        loader.save_processed_data(regional_analysis, "regional_analysis.csv")
-        
-        print("\nMarket Summary:")
-        print(market_summary)
-        
-        print("\nRegional Analysis:")
-        if regional_analysis is not None:
-            print(regional_analysis[['region', 'market_value_million_usd', 'value_share_pct']])
-        else:
-            print("No regional analysis data available")
+    # Outputs are only rebuilt when the raw market data changed since the last run
+    graph = BuildGraph(loader.processed_path / "build_state.json", metrics=loader.metrics)
+    add_market_steps(graph, loader)
+    # Saves block on the write so a failed one is never recorded as built
+    for name in ('market_summary', 'regional_analysis'):
+        graph.add(f'save_{name}',
+                  lambda df, name=name: loader.save_processed_data(df, f"{name}.csv"),
+                  deps=[name], outputs=[loader.processed_path / f"{name}.csv"])
+    graph.run()
+    
+    market_summary = pd.read_csv(loader.processed_path / "market_summary.csv")
+    regional_analysis = pd.read_csv(loader.processed_path / "regional_analysis.csv")
+    
+    print("\nMarket Summary:")
+    print(market_summary)
+    
+    print("\nRegional Analysis:")
+    print(regional_analysis[['region', 'market_value_million_usd', 'value_share_pct']])
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    main()
@@ -0,0 +1,89 @@
+"""
+Frame Cache Module for Brazil Hydro Energy Sector Analysis
+Provides a bounded in-process LRU cache of loaded DataFrames
+"""
+
+from collections import OrderedDict
+import threading
+
+import pandas as pd
+
+def _copy(df):
+    """
+    Copy a frame so edits on one side never reach the other
+    
+    Under copy-on-write (always on from pandas 3) a shallow copy is enough and
+    costs no data; earlier pandas needs a deep copy, since in-place edits such
+    as df.loc[mask, col] = 0 would otherwise write through to shared columns.
+    """
+    copy_on_write = int(pd.__version__.split('.')[0]) >= 3 or pd.get_option('mode.copy_on_write') is True
+    return df.copy(deep=not copy_on_write)
+
+class FrameCache:
+    """Least-recently-used DataFrame cache bounded by a memory budget"""
+    
+    def __init__(self, max_bytes=256 * 1024 ** 2):
+        """
+        Initialize frame cache
+        
+        Args:
+            max_bytes (int): Memory budget in bytes, measured with
+                memory_usage(deep=True); 0 disables caching
+        """
+        self.max_bytes = max_bytes
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, key):
+        """Return the cached frame for a key, or None on a miss"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            # Copy so callers editing the frame do not alter the cached one
+            return _copy(entry[0])
+    
+    def put(self, key, df):
+        """Store a copy of a frame, evicting least-recently-used entries to stay within budget"""
+        size = int(df.memory_usage(deep=True).sum())
+        if size > self.max_bytes:
+            return
+        
+        with self._lock:
+            if key in self._entries:
+                self.current_bytes -= self._entries.pop(key)[1]
+            while self._entries and self.current_bytes + size > self.max_bytes:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self.current_bytes -= evicted_size
+                self.evictions += 1
+            # Keep a copy so the caller's frame and the cached one stay independent
+            self._entries[key] = (_copy(df), size)
+            self.current_bytes += size
+    
+    def clear(self):
+        """Drop every cached frame"""
+        with self._lock:
+            self._entries.clear()
+            self.current_bytes = 0
+    
+    def stats(self):
+        """Return hit/miss counters and current memory use"""
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'entries': len(self._entries),
+                'bytes': self.current_bytes,
+                'max_bytes': self.max_bytes,
+            }
+    
+    def __len__(self):
+        return len(self._entries)
\ No newline at end of file
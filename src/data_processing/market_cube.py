@@ -0,0 +1,138 @@
+"""
+Market Cube Module for Brazil Hydro Energy Sector Analysis
+Precomputes year x region metric totals so slice queries avoid rescanning rows
+"""
+
+import pandas as pd
+import numpy as np
+
+try:
+    from .data_loader import SUMMARY_METRICS, GROWTH_METRICS, sum_dtype
+except ImportError:
+    # Allow running alongside data_loader as a script
+    from data_loader import SUMMARY_METRICS, GROWTH_METRICS, sum_dtype
+
+class MarketCube:
+    """Dense year x region x metric cube of market totals with year and region marginals"""
+    
+    def __init__(self, df, metrics=None):
+        """
+        Build the cube from market rows
+        
+        Args:
+            df (pd.DataFrame): Market data with year and region columns
+            metrics (list): Metric columns to aggregate (optional, defaults to SUMMARY_METRICS)
+        """
+        self.metrics = list(metrics) if metrics is not None else list(SUMMARY_METRICS)
+        # Totals are int64 for integer metrics and float64 otherwise, so int32 sums cannot wrap
+        self.dtypes = {col: sum_dtype(df[col].dtype) for col in self.metrics}
+        
+        year_codes, years = pd.factorize(df['year'], sort=True)
+        region_codes, regions = pd.factorize(df['region'], sort=True)
+        self.years = np.asarray(years)
+        self.regions = np.asarray(regions, dtype=object)
+        self._year_index = {year: i for i, year in enumerate(self.years.tolist())}
+        self._region_index = {region: i for i, region in enumerate(self.regions.tolist())}
+        self._metric_index = {metric: i for i, metric in enumerate(self.metrics)}
+        
+        n_years, n_regions = len(self.years), len(self.regions)
+        valid = (year_codes >= 0) & (region_codes >= 0)
+        cells = year_codes[valid].astype(np.intp) * n_regions + region_codes[valid]
+        
+        self.counts = np.bincount(cells, minlength=n_years * n_regions).reshape(n_years, n_regions)
+        self.cells = np.empty((n_years, n_regions, len(self.metrics)))
+        for i, col in enumerate(self.metrics):
+            values = np.nan_to_num(df[col].to_numpy(dtype='float64')[valid])
+            sums = np.bincount(cells, weights=values, minlength=n_years * n_regions)
+            self.cells[:, :, i] = sums.reshape(n_years, n_regions)
+        
+        # Marginals
+        self.year_totals = self.cells.sum(axis=1)
+        self.region_totals = self.cells.sum(axis=0)
+        self.grand_total = self.year_totals.sum(axis=0)
+        
+        self._summary = None
+    
+    def value(self, metric, year=None, region=None):
+        """
+        Return one total in O(1)
+        
+        Args:
+            metric (str): Metric column
+            year (int): Year (optional, all years when omitted)
+            region (str): Region (optional, all regions when omitted)
+        """
+        m = self._metric_index[metric]
+        if year is None and region is None:
+            return self.grand_total[m]
+        if region is None:
+            return self.year_totals[self._year_index[year], m]
+        if year is None:
+            return self.region_totals[self._region_index[region], m]
+        return self.cells[self._year_index[year], self._region_index[region], m]
+    
+    def slice(self, years=None, regions=None, metrics=None):
+        """
+        Return the totals for a block of cells as a long-format frame
+        
+        Args:
+            years (list): Years to include (optional, all when omitted)
+            regions (list): Regions to include (optional, all when omitted)
+            metrics (list): Metrics to include (optional, all when omitted)
+        """
+        y = [self._year_index[year] for year in years] if years is not None else range(len(self.years))
+        r = [self._region_index[region] for region in regions] if regions is not None else range(len(self.regions))
+        metrics = list(metrics) if metrics is not None else self.metrics
+        m = [self._metric_index[metric] for metric in metrics]
+        
+        block = self.cells[np.ix_(list(y), list(r), m)]
+        present = self.counts[np.ix_(list(y), list(r))] > 0
+        yy, rr = np.nonzero(present)
+        result = pd.DataFrame({
+            'year': self.years[list(y)][yy],
+            'region': pd.Categorical(self.regions[list(r)][rr], categories=self.regions),
+        })
+        for i, metric in enumerate(metrics):
+            result[metric] = block[yy, rr, i].astype(self.dtypes[metric])
+        return result
+    
+    def market_summary(self):
+        """Return the per-year summary in the layout of HydroDataLoader.get_market_summary"""
+        if self._summary is None:
+            present = self.counts.sum(axis=1) > 0
+            summary = pd.DataFrame({'year': self.years[present]})
+            for metric in SUMMARY_METRICS:
+                totals = self.year_totals[present, self._metric_index[metric]]
+                summary[metric] = totals.astype(self.dtypes[metric])
+            for col in GROWTH_METRICS:
+                summary[f'{col}_growth_pct'] = summary[col].pct_change() * 100
+            self._summary = summary
+        return self._summary.copy()
+    
+    def regional_analysis(self, year=None):
+        """
+        Return per-region totals and market shares for one year
+        
+        Rows are one per region, aggregated over every market row of that
+        region, in the layout of HydroDataLoader.get_regional_analysis.
+        
+        Args:
+            year (int): Year to analyse (optional, defaults to the latest year)
+        
+        Returns:
+            pd.DataFrame: Regional analysis, or None if the cube has no rows for the year
+        """
+        if year is None:
+            years = self.years[self.counts.sum(axis=1) > 0]
+            if len(years) == 0:
+                return None
+            year = years[-1]
+        if year not in self._year_index:
+            return None
+        regional = self.slice(years=[year])
+        
+        total_capacity = self.value('installed_capacity_mw', year=year)
+        total_value = self.value('market_value_million_usd', year=year)
+        regional['capacity_share_pct'] = (regional['installed_capacity_mw'] / total_capacity) * 100
+        regional['value_share_pct'] = (regional['market_value_million_usd'] / total_value) * 100
+        return regional
\ No newline at end of file
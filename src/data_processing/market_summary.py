@@ -0,0 +1,116 @@
+"""
+Incremental Market Summary Module for Brazil Hydro Energy Sector Analysis
+Maintains per-year market aggregates that are updated from row deltas
+"""
+
+import pandas as pd
+import numpy as np
+from pathlib import Path
+
+try:
+    from .data_loader import SUMMARY_METRICS, GROWTH_METRICS
+except ImportError:
+    # Allow running alongside data_loader as a script
+    from data_loader import SUMMARY_METRICS, GROWTH_METRICS
+
+class IncrementalMarketSummary:
+    """Per-year market summary maintained from new or changed rows"""
+    
+    def __init__(self, path=None):
+        """
+        Initialize incremental summary
+        
+        Args:
+            path (str): CSV file the aggregates are persisted to (optional)
+        """
+        self.path = Path(path) if path is not None else None
+        self._summary = pd.DataFrame(
+            columns=['year'] + SUMMARY_METRICS + [f'{col}_growth_pct' for col in GROWTH_METRICS],
+            dtype='float64'
+        ).set_index('year')
+        
+        if self.path is not None and self.path.exists():
+            self._summary = pd.read_csv(self.path).set_index('year')
+    
+    @classmethod
+    def from_frame(cls, df, path=None):
+        """Build a summary from a full market data frame"""
+        summary = cls(path)
+        summary._summary = summary._summary.iloc[0:0]
+        summary.update(df, mode='replace')
+        return summary
+    
+    def update(self, rows, mode='add'):
+        """
+        Fold a batch of market rows into the per-year totals
+        
+        Args:
+            rows (pd.DataFrame): New or changed market rows
+            mode (str): 'add' adds the rows to the existing year totals;
+                'replace' treats them as the complete data for their years
+        
+        Returns:
+            list: Years whose totals or growth rates changed
+        """
+        if mode not in ('add', 'replace'):
+            raise ValueError(f"Unknown update mode '{mode}', expected 'add' or 'replace'")
+        if rows is None or rows.empty:
+            return []
+        
+        delta = rows.groupby('year')[SUMMARY_METRICS].sum().astype('float64')
+        delta.index = delta.index.astype('int64')
+        
+        totals = self._summary[SUMMARY_METRICS].astype('float64')
+        if mode == 'add':
+            totals = totals.add(delta, fill_value=0)
+        else:
+            totals = pd.concat([totals.drop(delta.index, errors='ignore'), delta])
+        # An empty summary has a float64 index, which the concat or add would keep
+        totals.index = totals.index.astype('int64')
+        totals = totals.sort_index()
+        
+        growth = self._summary.drop(columns=SUMMARY_METRICS).reindex(totals.index)
+        self._summary = pd.concat([totals, growth], axis=1)
+        
+        # Growth for a year depends only on it and the preceding year, so only
+        # the changed years and their successors need recomputing
+        positions = totals.index.get_indexer(delta.index)
+        affected = np.unique(np.concatenate([positions, positions + 1]))
+        affected = affected[affected < len(totals)]
+        self._recompute_growth(affected)
+        
+        return totals.index[affected].tolist()
+    
+    def _recompute_growth(self, positions):
+        """Recompute growth columns for the given row positions"""
+        values = self._summary[GROWTH_METRICS].to_numpy(dtype='float64')
+        previous = np.full((len(positions), len(GROWTH_METRICS)), np.nan)
+        has_previous = positions > 0
+        previous[has_previous] = values[positions[has_previous] - 1]
+        
+        with np.errstate(divide='ignore', invalid='ignore'):
+            growth = (values[positions] / previous - 1) * 100
+        
+        for i, col in enumerate(GROWTH_METRICS):
+            col_idx = self._summary.columns.get_loc(f'{col}_growth_pct')
+            self._summary.iloc[positions, col_idx] = growth[:, i]
+    
+    @property
+    def summary(self):
+        """Return the summary in the same layout as HydroDataLoader.get_market_summary"""
+        summary = self._summary.reset_index()
+        summary['year'] = summary['year'].astype('int64')
+        summary['number_of_plants'] = summary['number_of_plants'].astype('int64')
+        return summary
+    
+    def save(self, path=None):
+        """Persist the per-year aggregates to CSV"""
+        path = Path(path) if path is not None else self.path
+        if path is None:
+            raise ValueError("No path given to save the market summary to")
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.summary.to_csv(path, index=False)
+        self.path = path
+    
+    def __len__(self):
+        return len(self._summary)
\ No newline at end of file
@@ -0,0 +1,187 @@
+"""
+Metrics Module for Brazil Hydro Energy Sector Analysis
+Provides pluggable per-stage instrumentation hooks for the data loader
+"""
+
+from contextlib import contextmanager
+from dataclasses import dataclass, field, asdict
+import logging
+import threading
+import time
+import tracemalloc
+
+@dataclass
+class StageMetrics:
+    """Measurements for one load, aggregate or save stage"""
+    stage: str
+    name: str
+    duration_s: float = 0.0
+    rows: int = 0
+    bytes_read: int = 0
+    bytes_written: int = 0
+    peak_bytes: int = None
+    status: str = 'ok'
+    extra: dict = field(default_factory=dict)
+    
+    @property
+    def rows_per_s(self):
+        """Throughput in rows per second"""
+        return self.rows / self.duration_s if self.duration_s > 0 else 0.0
+    
+    def to_dict(self):
+        record = asdict(self)
+        record['rows_per_s'] = self.rows_per_s
+        return record
+
+class MetricsHook:
+    """Base hook that discards every measurement"""
+    
+    # When False, stages skip timing entirely so the default costs nothing
+    enabled = False
+    # When True, stages trace peak Python allocations with tracemalloc
+    track_memory = False
+    
+    def emit(self, metrics):
+        """Receive the measurements of a finished stage"""
+
+class NullMetricsHook(MetricsHook):
+    """No-op hook used by default"""
+
+class LoggingMetricsHook(MetricsHook):
+    """Hook that logs one line per stage"""
+    
+    enabled = True
+    
+    def __init__(self, logger=None, level=logging.INFO, track_memory=False):
+        """
+        Initialize logging hook
+        
+        Args:
+            logger (logging.Logger): Target logger (optional, defaults to this module's)
+            level (int): Log level for stage records
+            track_memory (bool): Trace peak allocation per stage (slower)
+        """
+        self.logger = logger or logging.getLogger(__name__)
+        self.level = level
+        self.track_memory = track_memory
+    
+    def emit(self, metrics):
+        message = (f"{metrics.stage} {metrics.name}: {metrics.rows} rows in "
+                   f"{metrics.duration_s * 1000:.1f} ms ({metrics.rows_per_s:,.0f} rows/s)")
+        if metrics.bytes_read:
+            message += f", {metrics.bytes_read:,} bytes read"
+        if metrics.bytes_written:
+            message += f", {metrics.bytes_written:,} bytes written"
+        if metrics.peak_bytes is not None:
+            message += f", peak {metrics.peak_bytes / 2 ** 20:.1f} MiB"
+        if metrics.status != 'ok':
+            message += f" [{metrics.status}]"
+        self.logger.log(self.level, message)
+
+class InMemoryMetricsHook(MetricsHook):
+    """Hook that keeps every stage record for later aggregation"""
+    
+    enabled = True
+    
+    def __init__(self, track_memory=True):
+        """
+        Initialize in-memory hook
+        
+        Args:
+            track_memory (bool): Trace peak allocation per stage
+        """
+        self.track_memory = track_memory
+        self.records = []
+        self._lock = threading.Lock()
+    
+    def emit(self, metrics):
+        with self._lock:
+            self.records.append(metrics)
+    
+    def to_frame(self):
+        """Return the collected records as a DataFrame"""
+        import pandas as pd
+        return pd.DataFrame([record.to_dict() for record in self.records])
+    
+    def totals(self):
+        """Return total duration, rows and bytes per (stage, name), slowest first"""
+        df = self.to_frame()
+        if df.empty:
+            return df
+        totals = df.groupby(['stage', 'name']).agg(
+            calls=('duration_s', 'size'),
+            duration_s=('duration_s', 'sum'),
+            rows=('rows', 'sum'),
+            bytes_read=('bytes_read', 'sum'),
+            bytes_written=('bytes_written', 'sum'),
+            peak_bytes=('peak_bytes', 'max'),
+        )
+        totals['rows_per_s'] = totals['rows'] / totals['duration_s']
+        return totals.sort_values('duration_s', ascending=False).reset_index()
+    
+    def clear(self):
+        with self._lock:
+            self.records.clear()
+
+# tracemalloc is process-wide: it runs while any traced stage is active and
+# is stopped by the last one to finish, unless it was already running
+_tracing_lock = threading.Lock()
+_traced_stages = 0
+_started_tracing = False
+
+def _begin_tracing():
+    global _traced_stages, _started_tracing
+    with _tracing_lock:
+        if _traced_stages == 0 and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            _started_tracing = True
+        _traced_stages += 1
+
+def _end_tracing():
+    """Leave a traced stage, returning the process-wide peak traced so far"""
+    global _traced_stages, _started_tracing
+    with _tracing_lock:
+        peak = tracemalloc.get_traced_memory()[1] if tracemalloc.is_tracing() else None
+        _traced_stages -= 1
+        if _traced_stages == 0 and _started_tracing:
+            tracemalloc.stop()
+            _started_tracing = False
+        return peak
+
+@contextmanager
+def measure_stage(hook, stage, name):
+    """
+    Time a block and emit its StageMetrics to a hook
+    
+    The block fills in rows and byte counts on the yielded record. All traced
+    stages share one tracemalloc session, which covers every thread, so the
+    peak is process-wide: it includes allocations of concurrent stages and
+    is the highest reached since the earliest still-running traced stage
+    began.
+    
+    Args:
+        hook (MetricsHook): Destination for the measurements
+        stage (str): Stage kind, e.g. 'load', 'aggregate' or 'save'
+        name (str): What the stage operates on, e.g. the dataset name
+    """
+    if not hook.enabled:
+        # A fresh record per call, so concurrent stages never share one
+        yield StageMetrics(stage=stage, name=name)
+        return
+    
+    record = StageMetrics(stage=stage, name=name)
+    if hook.track_memory:
+        _begin_tracing()
+    start = time.perf_counter()
+    try:
+        yield record
+    except BaseException:
+        record.status = 'error'
+        raise
+    finally:
+        record.duration_s = time.perf_counter() - start
+        if hook.track_memory:
+            peak = _end_tracing()
+            if peak is not None:
+                record.peak_bytes = peak
+        hook.emit(record)
\ No newline at end of file
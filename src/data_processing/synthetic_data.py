@@ -0,0 +1,224 @@
+"""
+Synthetic Data Module for Brazil Hydro Energy Sector Analysis
+Generates schema-faithful raw datasets at arbitrary scale for load testing
+"""
+
+import argparse
+from itertools import combinations
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+try:
+    from .data_loader import MARKET_SCHEMA, COMPETITOR_SCHEMA, CUSTOMER_SCHEMA
+except ImportError:
+    # Allow running alongside data_loader as a script
+    from data_loader import MARKET_SCHEMA, COMPETITOR_SCHEMA, CUSTOMER_SCHEMA
+
+# Region weights follow the installed capacity split of the shipped market data
+REGIONS = ['Southeast', 'South', 'Northeast', 'Central-West', 'North']
+REGION_WEIGHTS = [0.40, 0.21, 0.15, 0.14, 0.10]
+
+SERVICES = ['Transmission', 'Distribution', 'Energy Trading', 'Consulting',
+            'Energy Services', 'Storage', 'Telecom']
+PRESENCE = ['Nationwide', 'Southeast', 'South', 'Northeast', 'North', 'Central-West',
+            'Minas Gerais', 'Parana', 'Sao Paulo']
+PRESENCE_WEIGHTS = [0.2, 0.25, 0.1, 0.08, 0.05, 0.05, 0.1, 0.07, 0.1]
+COMPANY_PREFIXES = ['Energia', 'Hidro', 'Eletro', 'Companhia Energetica', 'Geracao', 'Usina']
+
+CUSTOMER_TYPES = ['Utility Company', 'Industrial User', 'Commercial Complex', 'Municipal Government',
+                  'Agricultural Cooperative', 'Mining Company', 'Data Center', 'Residential Complex']
+SIZE_CATEGORIES = ['Large', 'Medium', 'Small']
+SIZE_WEIGHTS = [0.3, 0.45, 0.25]
+# Per size category: (median consumption GWh, decision months, contract years)
+SIZE_PROFILES = {
+    'Large': (1500, 13, 11),
+    'Medium': (500, 7, 7),
+    'Small': (180, 5, 4),
+}
+TECHNOLOGY_BY_SIZE = {
+    'Large': (['Conventional Hydro', 'Pumped Storage'], [0.7, 0.3]),
+    'Medium': (['Small Hydro', 'Micro Hydro', 'Pumped Storage'], [0.65, 0.3, 0.05]),
+    'Small': (['Micro Hydro', 'Small Hydro'], [0.85, 0.15]),
+}
+CONCERNS = ['Reliability', 'Cost Efficiency', 'Regulatory Compliance', 'Grid Stability',
+            'Environmental Impact', 'Maintenance', 'Energy Cost', 'Supply Security',
+            'Process Integration', 'Operational Efficiency', 'Energy Management', 'Compliance',
+            'Energy Savings', 'Green Certification', 'Operational Cost', 'Initial Investment',
+            'ROI', 'Community Benefits', 'Sustainability', 'Energy Security', 'Uptime Requirements',
+            'Cost Reduction', 'Environmental Impact', 'Local Generation', 'Water Management']
+CONCERNS = list(dict.fromkeys(CONCERNS))
+
+# Comma-joined lists are drawn from precomputed combination tables, so they
+# can be sampled as a vectorized index instead of joined row by row
+PORTFOLIOS = np.array(
+    [','.join(('Generation',) + combo) for k in (1, 2) for combo in combinations(SERVICES, k)],
+    dtype=object
+)
+CONCERN_SETS = np.array([','.join(combo) for combo in combinations(CONCERNS, 3)], dtype=object)
+
+DEFAULT_CHUNK_ROWS = 500_000
+
+class SyntheticDataGenerator:
+    """Seeded, streaming generator for the three raw dataset schemas"""
+    
+    def __init__(self, seed=42, chunk_rows=DEFAULT_CHUNK_ROWS):
+        """
+        Initialize generator
+        
+        Args:
+            seed (int): Random seed; the same seed and chunk size give identical files
+            chunk_rows (int): Rows held in memory at once while writing
+        """
+        self.seed = seed
+        self.chunk_rows = chunk_rows
+    
+    def _rng(self, stream):
+        """Independent random stream per dataset"""
+        return np.random.default_rng([self.seed, stream])
+    
+    def _write(self, path, n_rows, make_chunk, rng):
+        """Write n_rows to a CSV, one bounded chunk at a time"""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'w', newline='') as f:
+            # A zero-row request still writes the header
+            for start in range(0, max(n_rows, 1), self.chunk_rows):
+                size = min(self.chunk_rows, n_rows - start)
+                make_chunk(rng, size, start, n_rows).to_csv(f, index=False, header=start == 0)
+        print(f"Wrote {n_rows:,} synthetic rows: {path}")
+        return path
+    
+    @staticmethod
+    def _market_chunk(rng, size, offset, n_rows, years=(2000, 2024)):
+        """Plant-level market rows; generation, value and investment scale with capacity"""
+        capacity = rng.gamma(1.5, 600.0, size).round(1)
+        capacity_factor = rng.beta(8, 11, size)
+        generation = (capacity * capacity_factor * 8.76).round(1)
+        market_value = (generation * rng.normal(0.062, 0.006, size)).clip(0).round(2)
+        investment = (market_value * rng.normal(0.11, 0.02, size)).clip(0).round(2)
+        df = pd.DataFrame({
+            'year': rng.integers(years[0], years[1] + 1, size),
+            'region': rng.choice(REGIONS, size, p=REGION_WEIGHTS),
+            'installed_capacity_mw': capacity,
+            'generation_gwh': generation,
+            'market_value_million_usd': market_value,
+            'investment_million_usd': investment,
+            'number_of_plants': 1 + rng.poisson(0.4, size),
+        })
+        return df[list(MARKET_SCHEMA)]
+    
+    @staticmethod
+    def _competitor_chunk(rng, size, offset, n_rows):
+        """Competitor rows with a heavy-tailed market share distribution"""
+        ids = np.arange(offset, offset + size)
+        prefixes = np.array(COMPANY_PREFIXES, dtype=object)[rng.integers(0, len(COMPANY_PREFIXES), size)]
+        # Pareto weights (mean 3) give a few large players and a long tail of
+        # small ones, scaled so shares sum to about 100% across the whole file
+        share = (rng.pareto(1.5, size) + 1) * 100 / (3 * max(n_rows, 1))
+        strength = rng.normal(6.5, 1.0, size).clip(1, 10)
+        df = pd.DataFrame({
+            'company_name': prefixes + ' ' + pd.Series(ids).map('{:07d}'.format).to_numpy(dtype=object),
+            'market_share_percent': share.round(4),
+            'installed_capacity_mw': (share * rng.normal(1280, 60, size)).round(1),
+            'service_portfolio': PORTFOLIOS[rng.integers(0, len(PORTFOLIOS), size)],
+            'geographic_presence': rng.choice(PRESENCE, size, p=PRESENCE_WEIGHTS),
+            'strength_score': strength.round(1),
+            # Weaker companies face more threats and see fewer opportunities
+            'weakness_score': (14 - strength + rng.normal(0, 0.3, size)).clip(1, 10).round(1),
+            'opportunity_score': (0.8 * strength + 2 + rng.normal(0, 0.4, size)).clip(1, 10).round(1),
+            'threat_score': (13.5 - strength + rng.normal(0, 0.3, size)).clip(1, 10).round(1),
+        })
+        return df[list(COMPETITOR_SCHEMA)]
+    
+    @staticmethod
+    def _customer_chunk(rng, size, offset, n_rows):
+        """Customer rows whose consumption, budget and contract terms depend on size"""
+        sizes = rng.choice(SIZE_CATEGORIES, size, p=SIZE_WEIGHTS)
+        consumption = np.empty(size)
+        decision = np.empty(size, dtype=np.int64)
+        contract = np.empty(size, dtype=np.int64)
+        technology = np.empty(size, dtype=object)
+        for category, (median, months, years) in SIZE_PROFILES.items():
+            mask = sizes == category
+            n = int(mask.sum())
+            consumption[mask] = median * rng.lognormal(0, 0.5, n)
+            decision[mask] = np.maximum(1, rng.poisson(months, n))
+            contract[mask] = np.maximum(1, rng.poisson(years, n))
+            choices, weights = TECHNOLOGY_BY_SIZE[category]
+            technology[mask] = rng.choice(choices, n, p=weights)
+        
+        consumption = np.maximum(10, consumption.round(-1))
+        # Budgets span roughly 10-20% of annual consumption in million USD
+        low = np.maximum(10, (consumption * rng.uniform(0.08, 0.12, size)).round(-1)).astype(np.int64)
+        high = low * 2
+        df = pd.DataFrame({
+            'customer_type': rng.choice(CUSTOMER_TYPES, size),
+            'size_category': sizes,
+            'annual_consumption_gwh': consumption.astype(np.int64),
+            'decision_making_time_months': decision,
+            'budget_range_million_usd': pd.Series(low).astype(str) + '-' + pd.Series(high).astype(str),
+            'primary_concerns': CONCERN_SETS[rng.integers(0, len(CONCERN_SETS), size)],
+            'technology_preference': technology,
+            'geographic_location': rng.choice(REGIONS, size, p=REGION_WEIGHTS),
+            'contract_duration_years': contract,
+        })
+        return df[list(CUSTOMER_SCHEMA)]
+    
+    def write_market_data(self, path, n_rows):
+        """Write n_rows of brazil_hydro_data.csv-shaped market data"""
+        return self._write(path, n_rows, self._market_chunk, self._rng(0))
+    
+    def write_competitor_data(self, path, n_rows):
+        """Write n_rows of competitor_data.csv-shaped competitor data"""
+        return self._write(path, n_rows, self._competitor_chunk, self._rng(1))
+    
+    def write_customer_data(self, path, n_rows):
+        """Write n_rows of customer_data.csv-shaped customer data"""
+        return self._write(path, n_rows, self._customer_chunk, self._rng(2))
+    
+    def write_all(self, data_path, market_rows, competitor_rows=None, customer_rows=None):
+        """
+        Write a complete raw data directory that HydroDataLoader(data_path) can read
+        
+        Args:
+            data_path (str): Data directory; files go under its raw/ subdirectory
+            market_rows (int): Market rows to write
+            competitor_rows (int): Competitor rows (optional, defaults to market_rows)
+            customer_rows (int): Customer rows (optional, defaults to market_rows)
+        
+        Returns:
+            dict: Dataset name to written path
+        """
+        raw_path = Path(data_path) / "raw"
+        return {
+            'market': self.write_market_data(raw_path / "brazil_hydro_data.csv", market_rows),
+            'competitor': self.write_competitor_data(
+                raw_path / "competitor_data.csv",
+                market_rows if competitor_rows is None else competitor_rows),
+            'customer': self.write_customer_data(
+                raw_path / "customer_data.csv",
+                market_rows if customer_rows is None else customer_rows),
+        }
+
+def main():
+    """Generate a synthetic data directory from the command line"""
+    parser = argparse.ArgumentParser(description="Generate synthetic hydro energy datasets")
+    parser.add_argument('data_path', help="Output data directory (files go under <data_path>/raw)")
+    parser.add_argument('--rows', type=float, default=1e6, help="Market rows (e.g. 1e9)")
+    parser.add_argument('--competitor-rows', type=float, default=None)
+    parser.add_argument('--customer-rows', type=float, default=None)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--chunk-rows', type=int, default=DEFAULT_CHUNK_ROWS)
+    args = parser.parse_args()
+    
+    generator = SyntheticDataGenerator(seed=args.seed, chunk_rows=args.chunk_rows)
+    generator.write_all(
+        args.data_path, int(args.rows),
+        int(args.competitor_rows) if args.competitor_rows is not None else None,
+        int(args.customer_rows) if args.customer_rows is not None else None,
+    )
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,23 @@
+"""
+Pipeline Module for Brazil Hydro Energy Sector Analysis
+"""
+
+import importlib
+
+# Submodules are imported on first attribute access (PEP 562)
+_LAZY_ATTRS = {
+    'build_pipeline': '.tasks',
+    'PIPELINE_TARGETS': '.tasks',
+}
+
+__all__ = ['build_pipeline', 'PIPELINE_TARGETS']
+
+def __getattr__(name):
+    if name in _LAZY_ATTRS:
+        value = getattr(importlib.import_module(_LAZY_ATTRS[name], __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
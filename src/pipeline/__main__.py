@@ -0,0 +1,47 @@
+"""
+Pipeline runner for Brazil Hydro Energy Sector Analysis
+
+Usage:
+    python -m src.pipeline                          # run on every core with threads
+    python -m src.pipeline --workers 8 --executor process
+    python -m src.pipeline --force --targets save_market_trends_chart
+    python -m src.pipeline --chart-dir reports/charts --plotlyjs shared
+"""
+
+import argparse
+import logging
+import os
+import sys
+
+from .tasks import PIPELINE_TARGETS, build_pipeline
+from ..data_processing.build_graph import EXECUTORS
+from ..visualization.chart_generator import PLOTLYJS_MODES
+
+def main():
+    """Run the analysis pipeline from the command line"""
+    parser = argparse.ArgumentParser(description="Run the hydro analysis pipeline")
+    parser.add_argument('--data-path', default=None, help="Data directory (defaults to the project's data/)")
+    parser.add_argument('--chart-dir', default='.', help="Directory for the HTML charts")
+    parser.add_argument('--plotlyjs', choices=PLOTLYJS_MODES, default='inline',
+                        help="Embed plotly.js in every chart, share one copy per directory, or use the CDN")
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1,
+                        help="Steps run at once (1 runs them in order)")
+    parser.add_argument('--executor', choices=EXECUTORS, default='thread')
+    parser.add_argument('--targets', nargs='+', default=PIPELINE_TARGETS,
+                        help="Steps to bring up to date")
+    parser.add_argument('--force', action='store_true', help="Rerun every step")
+    parser.add_argument('--no-report', action='store_true', help="Skip the critical-path timing report")
+    args = parser.parse_args()
+    
+    logging.basicConfig(level=logging.WARNING, format='%(message)s')
+    graph = build_pipeline(args.data_path, args.chart_dir, args.plotlyjs)
+    unknown = [name for name in args.targets if name not in graph.steps]
+    if unknown:
+        parser.error(f"unknown targets {unknown}, expected some of {list(graph.steps)}")
+    
+    report = graph.run(args.targets, force=args.force, workers=args.workers, executor=args.executor)
+    print(report.summary() if args.no_report else report.timing_report())
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
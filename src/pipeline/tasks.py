@@ -0,0 +1,93 @@
+"""
+Pipeline Tasks for Brazil Hydro Energy Sector Analysis
+Models the load -> summarize -> chart -> save flow of the data loader and
+chart generator scripts as build graph steps
+"""
+
+from functools import lru_cache, partial
+from pathlib import Path
+
+from ..data_processing.build_graph import BuildGraph
+from ..data_processing.data_loader import HydroDataLoader
+
+# Output steps that make up the full pipeline
+PIPELINE_TARGETS = [
+    'save_market_summary',
+    'save_regional_analysis',
+    'save_market_trends_chart',
+    'save_regional_analysis_chart',
+]
+
+# Step functions are module-level and take only picklable arguments, so they
+# can run on a process pool; each process builds its own loader and charts
+
+@lru_cache(maxsize=None)
+def _loader(data_path):
+    return HydroDataLoader(data_path)
+
+@lru_cache(maxsize=None)
+def _charts():
+    from ..visualization.chart_generator import HydroChartGenerator
+    return HydroChartGenerator()
+
+def load_market_data(data_path):
+    return _loader(data_path).load_market_data()
+
+def market_summary(data_path, market_data):
+    return _loader(data_path).get_market_summary(market_data)
+
+def regional_analysis(data_path, market_data):
+    return _loader(data_path).get_regional_analysis(market_data)
+
+def save_processed(data_path, filename, df):
+    return _loader(data_path).save_processed_data(df, filename)
+
+def market_trends_chart(market_summary):
+    return _charts().create_market_trends_chart(market_summary)
+
+def regional_analysis_chart(regional_analysis):
+    return _charts().create_regional_analysis_chart(regional_analysis)
+
+def save_chart(path, plotlyjs, fig):
+    # _write_chart raises, so a failed write is not recorded as built
+    _charts()._write_chart(fig, str(path), plotlyjs=plotlyjs)
+    return path
+
+def build_pipeline(data_path=None, chart_dir='.', plotlyjs='inline', metrics=None):
+    """
+    Build the graph of the full analysis pipeline
+    
+    The regional branch runs alongside the trends branch, and processed data
+    is saved while the charts are rendered.
+    
+    Args:
+        data_path (str): Path to data directory (optional)
+        chart_dir (str): Directory the HTML charts are written to
+        plotlyjs (str): 'inline', 'shared' or 'cdn' plotly.js in the HTML charts
+        metrics (MetricsHook): Receives a 'build' stage record per step (optional)
+    
+    Returns:
+        BuildGraph: Graph whose state is kept under the processed directory
+    """
+    loader = HydroDataLoader(data_path)
+    data_path = str(loader.data_path)
+    chart_dir = Path(chart_dir)
+    
+    graph = BuildGraph(loader.processed_path / "pipeline_state.json", metrics=metrics)
+    graph.add('market_data', partial(load_market_data, data_path), sources=loader.market_source_files)
+    graph.add('market_summary', partial(market_summary, data_path), deps=['market_data'])
+    graph.add('regional_analysis', partial(regional_analysis, data_path), deps=['market_data'])
+    
+    for name in ('market_summary', 'regional_analysis'):
+        graph.add(f'save_{name}', partial(save_processed, data_path, f"{name}.csv"),
+                  deps=[name], outputs=[loader.processed_path / f"{name}.csv"])
+    
+    graph.add('market_trends_chart', market_trends_chart, deps=['market_summary'])
+    graph.add('regional_analysis_chart', regional_analysis_chart, deps=['regional_analysis'])
+    for name in ('market_trends', 'regional_analysis'):
+        path = chart_dir / f"{name}.html"
+        # Switching the plotly.js mode rewrites the charts
+        graph.add(f'save_{name}_chart', partial(save_chart, path, plotlyjs),
+                  deps=[f'{name}_chart'], outputs=[path], version=plotlyjs)
+    
+    return graph
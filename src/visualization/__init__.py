@@ -2,6 +2,22 @@
 Visualization Module for Brazil Hydro Energy Sector Analysis
 """
 
-from .chart_generator import HydroChartGenerator
+import importlib
 
-__all__ = ['HydroChartGenerator'] 
\ No newline at end of file
+# Submodules are imported on first attribute access (PEP 562)
+_LAZY_ATTRS = {
+    'HydroChartGenerator': '.chart_generator',
+    'lttb_indices': '.downsample',
+}
+
+__all__ = ['HydroChartGenerator', 'lttb_indices']
+
+def __getattr__(name):
+    if name in _LAZY_ATTRS:
+        value = getattr(importlib.import_module(_LAZY_ATTRS[name], __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
\ No newline at end of file
@@ -5,19 +5,112 @@ Provides utilities for creating standardized visualizations
 
 import pandas as pd
 import numpy as np
-import plotly.express as px
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
-import matplotlib.pyplot as plt
-import seaborn as sns
+from pathlib import Path
+import atexit
+import inspect
+import os
+import re
+import threading
+import time
 import warnings
 warnings.filterwarnings('ignore')
 
+try:
+    from .downsample import LTTB_MAX_POINTS, lttb_indices
+except ImportError:
+    # Allow running this module directly as a script
+    from downsample import LTTB_MAX_POINTS, lttb_indices
+
+# Plotly, matplotlib and seaborn are imported inside the methods that use them,
+# so importing this module does not load the plotting stacks
+
+# Static image formats Kaleido can export, and the default number of renderer
+# tabs kept open for batch exports
+IMAGE_FORMATS = ('png', 'jpeg', 'webp', 'svg', 'pdf')
+DEFAULT_RENDERERS = 4
+
+# How HTML charts get plotly.js: embedded in every file, written once per
+# output directory and referenced, or loaded from the plotly CDN
+PLOTLYJS_MODES = ('inline', 'shared', 'cdn')
+
+# Scatter and line traces with at least this many points are drawn with WebGL
+WEBGL_MIN_POINTS = 5_000
+
+# Metrics plotted by the market trends chart, one subplot each
+TREND_METRICS = ['installed_capacity_mw', 'generation_gwh',
+                 'market_value_million_usd', 'investment_million_usd']
+
+class _RendererPool:
+    """Long-lived Kaleido browser with several renderer tabs, driven from a private event loop"""
+    
+    def __init__(self, renderers):
+        import asyncio
+        import kaleido
+        
+        self.renderers = renderers
+        self._asyncio = asyncio
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name='hydro-renderers', daemon=True)
+        self._thread.start()
+        self._kaleido = None
+        try:
+            self._kaleido = kaleido.Kaleido(n=renderers)
+            # Browser start-up is paid once here instead of once per image
+            self._call(self._kaleido.__aenter__())
+        except BaseException:
+            # Release Kaleido's helpers as well as the loop thread, so a failed
+            # start (e.g. no Chrome) leaves nothing running
+            if self._kaleido is not None:
+                try:
+                    self._call(self._kaleido.__aexit__(None, None, None))
+                except Exception:
+                    pass
+            self._stop_loop()
+            raise
+    
+    def _call(self, coroutine):
+        return self._asyncio.run_coroutine_threadsafe(coroutine, self._loop).result()
+    
+    def render(self, specs):
+        """Write every {'fig', 'path', 'opts'} spec concurrently, returning the errors"""
+        return self._call(self._kaleido.write_fig_from_object(specs, cancel_on_error=False))
+    
+    def _stop_loop(self):
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+    
+    def close(self):
+        try:
+            self._call(self._kaleido.__aexit__(None, None, None))
+        finally:
+            self._stop_loop()
+
 class HydroChartGenerator:
     """Chart generator class for hydro energy sector analysis"""
     
-    def __init__(self):
-        """Initialize chart generator"""
+    def __init__(self, plotlyjs='inline', webgl_threshold=WEBGL_MIN_POINTS, max_points=LTTB_MAX_POINTS):
+        """
+        Initialize chart generator
+        
+        Args:
+            plotlyjs (str): How saved HTML charts include plotly.js - 'inline'
+                (self-contained files), 'shared' (one versioned bundle per output
+                directory) or 'cdn'
+            webgl_threshold (int): Point count from which scatter and line
+                traces use WebGL (Scattergl) instead of SVG (None keeps SVG)
+            max_points (int): Default per-series point budget of the
+                time-series charts; longer series are reduced with LTTB
+        """
+        if plotlyjs not in PLOTLYJS_MODES:
+            raise ValueError(f"Unknown plotly.js mode '{plotlyjs}', expected one of {PLOTLYJS_MODES}")
+        self.plotlyjs = plotlyjs
+        self.webgl_threshold = webgl_threshold
+        self.max_points = max_points
+        
+        import matplotlib.pyplot as plt
+        import seaborn as sns
+        
         # Set default styles
         plt.style.use('seaborn-v0_8')
         sns.set_palette("husl")
@@ -32,9 +125,79 @@ class HydroChartGenerator:
             'qualitative': ['#1f77b4', '#ff7f0e', '#2ca02c', '#d62728', '#9467bd', '#8c564b', '#e377c2', '#7f7f7f'],
             'sequential': ['#f7fbff', '#deebf7', '#c6dbef', '#9ecae1', '#6baed6', '#4292c6', '#2171b5', '#08519c']
         }
+        
+        # Started on the first batch export
+        self._renderers = None
+        # Kaleido leaks helper threads when it cannot find Chrome, so a failed
+        # start is remembered instead of retried
+        self._renderer_error = None
+        # Directories already holding the shared plotly.js bundle
+        self._shared_dirs = set()
+        # Untitled figure dicts of already built chart variants, by chart type and trace types
+        self._skeletons = {}
+    
+    def _scatter(self, n_points):
+        """Scatter trace class for a point count: WebGL above the threshold, SVG below"""
+        import plotly.graph_objects as go
+        if self.webgl_threshold is not None and n_points >= self.webgl_threshold:
+            return go.Scattergl
+        return go.Scatter
+    
+    def _series(self, df, x, y, max_points, downsample=True):
+        """
+        Return the x and y of a series, reduced to max_points with LTTB
+        
+        Args:
+            df (pd.DataFrame): Data holding both columns
+            x (str): x column
+            y (str): y column
+            max_points (int): Point budget (optional, defaults to the generator's)
+            downsample (bool): False returns the series untouched
+        """
+        max_points = self.max_points if max_points is None else max_points
+        if not downsample or max_points is None or len(df) <= max_points:
+            return df[x], df[y]
+        if not df[x].is_monotonic_increasing:
+            df = df.sort_values(x)
+        keep = lttb_indices(df[x].to_numpy(), df[y].to_numpy(), max_points)
+        return df[x].iloc[keep], df[y].iloc[keep]
     
-    def create_market_trends_chart(self, market_summary, title="Brazil Hydro Energy Market Trends"):
-        """Create comprehensive market trends visualization"""
+    def _skeleton(self, key, build):
+        """Figure dict of a chart variant, built and validated once per generator"""
+        skeleton = self._skeletons.get(key)
+        if skeleton is None:
+            skeleton = self._skeletons[key] = build().to_dict()
+        return skeleton
+    
+    @staticmethod
+    def _from_skeleton(skeleton, trace_data, title):
+        """New figure from a skeleton with each trace's data arrays and the title filled in"""
+        import plotly.graph_objects as go
+        data = [{**trace, **arrays} for trace, arrays in zip(skeleton['data'], trace_data)]
+        layout = {**skeleton['layout'], 'title': {**skeleton['layout'].get('title', {}), 'text': title}}
+        # The skeleton was validated when it was built, so the copy skips validation
+        return go.Figure({'data': data, 'layout': layout}, _validate=False)
+    
+    def create_market_trends_chart(self, market_summary, title="Brazil Hydro Energy Market Trends",
+                                   max_points=None, downsample=True):
+        """
+        Create comprehensive market trends visualization
+        
+        Each series longer than max_points (default: the generator's budget)
+        is reduced with LTTB before its trace is built, unless downsample is False.
+        The layout and trace styling come from a cached skeleton per trace
+        type; only the data arrays and title are filled in per call.
+        """
+        series = [self._series(market_summary, 'year', col, max_points, downsample) for col in TREND_METRICS]
+        trace_types = tuple(self._scatter(len(x)) for x, _ in series)
+        skeleton = self._skeleton(('market_trends', trace_types),
+                                  lambda: self._build_market_trends_chart(trace_types))
+        return self._from_skeleton(skeleton, [{'x': x.to_numpy(), 'y': y.to_numpy()} for x, y in series], title)
+    
+    def _build_market_trends_chart(self, trace_types):
+        """Build the empty, styled market trends figure"""
+        from plotly.subplots import make_subplots
+        
         fig = make_subplots(
             rows=2, cols=2,
             subplot_titles=('Installed Capacity (MW)', 'Generation (GWh)', 
@@ -45,38 +208,33 @@ class HydroChartGenerator:
         
         # Installed Capacity
         fig.add_trace(
-            go.Scatter(x=market_summary['year'], y=market_summary['installed_capacity_mw'],
-                       mode='lines+markers', name='Installed Capacity',
-                       line=dict(color=self.colors['primary'][0], width=3)),
+            trace_types[0](x=[], y=[], mode='lines+markers', name='Installed Capacity',
+                           line=dict(color=self.colors['primary'][0], width=3)),
             row=1, col=1
         )
         
         # Generation
         fig.add_trace(
-            go.Scatter(x=market_summary['year'], y=market_summary['generation_gwh'],
-                       mode='lines+markers', name='Generation',
-                       line=dict(color=self.colors['primary'][1], width=3)),
+            trace_types[1](x=[], y=[], mode='lines+markers', name='Generation',
+                           line=dict(color=self.colors['primary'][1], width=3)),
             row=1, col=2
         )
         
         # Market Value
         fig.add_trace(
-            go.Scatter(x=market_summary['year'], y=market_summary['market_value_million_usd'],
-                       mode='lines+markers', name='Market Value',
-                       line=dict(color=self.colors['primary'][2], width=3)),
+            trace_types[2](x=[], y=[], mode='lines+markers', name='Market Value',
+                           line=dict(color=self.colors['primary'][2], width=3)),
             row=2, col=1
         )
         
         # Investment
         fig.add_trace(
-            go.Scatter(x=market_summary['year'], y=market_summary['investment_million_usd'],
-                       mode='lines+markers', name='Investment',
-                       line=dict(color=self.colors['primary'][3], width=3)),
+            trace_types[3](x=[], y=[], mode='lines+markers', name='Investment',
+                           line=dict(color=self.colors['primary'][3], width=3)),
             row=2, col=2
         )
         
         fig.update_layout(
-            title=title,
             height=800,
             showlegend=False
         )
@@ -84,7 +242,19 @@ class HydroChartGenerator:
         return fig
     
     def create_regional_analysis_chart(self, regional_data, title="Regional Market Analysis"):
-        """Create regional market analysis visualization"""
+        """Create regional market analysis visualization from a cached skeleton"""
+        skeleton = self._skeleton(('regional_analysis',), self._build_regional_analysis_chart)
+        regions = regional_data['region'].to_numpy(dtype=object)
+        return self._from_skeleton(skeleton, [
+            {'labels': regions, 'values': regional_data['market_value_million_usd'].to_numpy()},
+            {'x': regions, 'y': regional_data['installed_capacity_mw'].to_numpy()},
+        ], title)
+    
+    def _build_regional_analysis_chart(self):
+        """Build the empty, styled regional analysis figure"""
+        import plotly.graph_objects as go
+        from plotly.subplots import make_subplots
+        
         fig = make_subplots(
             rows=1, cols=2,
             subplot_titles=('Market Share by Region', 'Installed Capacity by Region'),
@@ -93,22 +263,17 @@ class HydroChartGenerator:
         
         # Market share pie chart
         fig.add_trace(
-            go.Pie(labels=regional_data['region'], 
-                   values=regional_data['market_value_million_usd'],
-                   name="Market Share"),
+            go.Pie(labels=[], values=[], name="Market Share"),
             row=1, col=1
         )
         
         # Capacity bar chart
         fig.add_trace(
-            go.Bar(x=regional_data['region'], 
-                   y=regional_data['installed_capacity_mw'],
-                   name="Installed Capacity"),
+            go.Bar(x=[], y=[], name="Installed Capacity"),
             row=1, col=2
         )
         
         fig.update_layout(
-            title=title,
             height=500
         )
         
@@ -116,6 +281,9 @@ class HydroChartGenerator:
     
     def create_competitor_analysis_chart(self, competitor_data, title="Competitive Analysis"):
         """Create competitive analysis visualization"""
+        import plotly.graph_objects as go
+        from plotly.subplots import make_subplots
+        
         fig = make_subplots(
             rows=1, cols=2,
             subplot_titles=('Market Share Distribution', 'Competitive Positioning'),
@@ -132,13 +300,14 @@ class HydroChartGenerator:
         
         # Competitive positioning scatter
         fig.add_trace(
-            go.Scatter(x=competitor_data['market_share_percent'],
-                       y=competitor_data['strength_score'],
-                       mode='markers+text',
-                       text=competitor_data['company_name'],
-                       textposition="top center",
-                       marker=dict(size=competitor_data['installed_capacity_mw']/1000),
-                       name="Positioning"),
+            self._scatter(len(competitor_data))(
+                x=competitor_data['market_share_percent'],
+                y=competitor_data['strength_score'],
+                mode='markers+text',
+                text=competitor_data['company_name'],
+                textposition="top center",
+                marker=dict(size=competitor_data['installed_capacity_mw']/1000),
+                name="Positioning"),
             row=1, col=2
         )
         
@@ -154,6 +323,9 @@ class HydroChartGenerator:
     
     def create_customer_segmentation_chart(self, customer_data, title="Customer Segmentation"):
         """Create customer segmentation visualization"""
+        import plotly.graph_objects as go
+        from plotly.subplots import make_subplots
+        
         # Customer type distribution
         customer_type_dist = customer_data['customer_type'].value_counts()
         size_category_dist = customer_data['size_category'].value_counts()
@@ -187,23 +359,36 @@ class HydroChartGenerator:
         
         return fig
     
-    def create_forecast_chart(self, historical_data, forecast_data, title="Market Forecast"):
-        """Create forecasting visualization"""
+    def create_forecast_chart(self, historical_data, forecast_data, title="Market Forecast",
+                              max_points=None, downsample=True):
+        """
+        Create forecasting visualization
+        
+        The historical and forecast series are each reduced with LTTB to
+        max_points (default: the generator's budget) unless downsample is False.
+        """
+        import plotly.graph_objects as go
+        
+        history_x, history_y = self._series(historical_data, 'year', 'market_value_million_usd',
+                                            max_points, downsample)
+        forecast_x, forecast_y = self._series(forecast_data, 'year', 'market_value_forecast',
+                                              max_points, downsample)
+        
         fig = go.Figure()
         
         # Historical data
-        fig.add_trace(go.Scatter(
-            x=historical_data['year'],
-            y=historical_data['market_value_million_usd'],
+        fig.add_trace(self._scatter(len(history_x))(
+            x=history_x,
+            y=history_y,
             mode='lines+markers',
             name='Historical',
             line=dict(color=self.colors['primary'][0], width=3)
         ))
         
         # Forecast data
-        fig.add_trace(go.Scatter(
-            x=forecast_data['year'],
-            y=forecast_data['market_value_forecast'],
+        fig.add_trace(self._scatter(len(forecast_x))(
+            x=forecast_x,
+            y=forecast_y,
             mode='lines+markers',
             name='Forecast',
             line=dict(color=self.colors['primary'][1], width=3, dash='dash')
@@ -220,6 +405,8 @@ class HydroChartGenerator:
     
     def create_technology_adoption_chart(self, tech_data, title="Technology Adoption"):
         """Create technology adoption visualization"""
+        import plotly.express as px
+        
         fig = px.bar(
             tech_data,
             x='technology',
@@ -234,6 +421,8 @@ class HydroChartGenerator:
     
     def create_risk_analysis_chart(self, risk_data, title="Risk Analysis"):
         """Create risk analysis visualization"""
+        import plotly.express as px
+        
         fig = px.bar(
             risk_data,
             x='risk_score',
@@ -247,54 +436,322 @@ class HydroChartGenerator:
         fig.update_layout(height=400)
         return fig
     
-    def save_chart(self, fig, filename, format='html'):
-        """Save chart to file"""
+    def save_chart(self, fig, filename, format='html', plotlyjs=None):
+        """Save chart to file; plotlyjs overrides the generator's HTML mode"""
         try:
-            if format == 'html':
-                fig.write_html(filename)
-            elif format == 'png':
-                fig.write_image(filename)
-            elif format == 'pdf':
-                fig.write_image(filename)
+            self._write_chart(fig, filename, format, plotlyjs)
             print(f"Chart saved: {filename}")
         except Exception as e:
             print(f"Error saving chart: {e}")
+    
+    def _write_chart(self, fig, filename, format='html', plotlyjs=None):
+        """Write a chart to file, raising on failure"""
+        if format != 'html' and format not in IMAGE_FORMATS:
+            raise ValueError(f"Unknown chart format '{format}', expected 'html' or one of {IMAGE_FORMATS}")
+        Path(filename).parent.mkdir(parents=True, exist_ok=True)
+        if format == 'html':
+            mode = plotlyjs or self.plotlyjs
+            if mode == 'shared':
+                fig.write_html(filename, include_plotlyjs=self._shared_plotlyjs(Path(filename).parent))
+            else:
+                fig.write_html(filename, include_plotlyjs=True if mode == 'inline' else 'cdn')
+        elif self._renderers is not None:
+            # export_images reports failures in its stats rather than raising
+            stats = self.export_images([(fig, filename, format)])
+            if stats['failed']:
+                raise RuntimeError(f"Image export of {filename} failed: {stats['errors'][0]}")
+        else:
+            fig.write_image(filename, format=format)
+    
+    def generate_batch(self, df, group_by='region', chart='market_trends', out_dir='charts',
+                       workers=None, format='html'):
+        """
+        Build and save one chart per group of rows on a process pool
+        
+        Each worker keeps its own generator with this one's options, so figure
+        skeletons are reused across the groups it handles.
+        
+        Args:
+            df (pd.DataFrame): Rows to split; market rows for 'market_trends'
+                and 'regional_analysis', competitor or customer rows otherwise
+            group_by (str or list): Column(s) to split on
+            chart (str): One of BATCH_CHARTS
+            out_dir (str): Directory the charts are written to
+            workers (int): Worker processes (optional, defaults to the CPU
+                count; never more than the number of groups, and 1 builds
+                every chart in this process)
+            format (str): 'html' or a static image format
+        
+        Returns:
+            dict: Manifest with the output path, row count, status and build,
+                save and total seconds of every group
+        """
+        if chart not in BATCH_CHARTS:
+            raise ValueError(f"Unknown batch chart '{chart}', expected one of {list(BATCH_CHARTS)}")
+        if format != 'html' and format not in IMAGE_FORMATS:
+            raise ValueError(f"Unknown chart format '{format}'")
+        
+        start = time.perf_counter()
+        out_dir = Path(out_dir)
+        out_dir.mkdir(parents=True, exist_ok=True)
+        options = (('plotlyjs', self.plotlyjs), ('webgl_threshold', self.webgl_threshold),
+                   ('max_points', self.max_points))
+        
+        tasks = []
+        for group, data in df.groupby(group_by, observed=True, sort=True):
+            # NumPy scalars become plain values so the manifest stays JSON-serializable
+            keys = group if isinstance(group, tuple) else (group,)
+            keys = tuple(key.item() if isinstance(key, np.generic) else key for key in keys)
+            group = keys if isinstance(group, tuple) else keys[0]
+            name = re.sub(r'[^A-Za-z0-9._-]+', '_', '_'.join(map(str, keys))).strip('_')
+            path = out_dir / f"{chart}_{name}.{format}"
+            tasks.append((chart, group, ', '.join(map(str, keys)), data, path, format))
+        
+        # Each worker process imports plotly, so never start more than there are groups
+        workers = min(workers or os.cpu_count() or 1, len(tasks))
+        if workers <= 1:
+            outputs = [_render_group(self, *task) for task in tasks]
+        else:
+            from concurrent.futures import ProcessPoolExecutor
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                futures = [pool.submit(_render_group_worker, options, *task) for task in tasks]
+                outputs = [future.result() for future in futures]
+        
+        duration = time.perf_counter() - start
+        failed = sum(output['status'] != 'ok' for output in outputs)
+        print(f"Generated {len(outputs) - failed}/{len(outputs)} {chart} charts "
+              f"in {duration:.2f} s with {workers} worker(s)")
+        return {
+            'chart': chart,
+            'group_by': group_by,
+            'out_dir': str(out_dir),
+            'workers': workers,
+            'duration_s': duration,
+            'failed': failed,
+            'outputs': outputs,
+        }
+    
+    @staticmethod
+    def _plotlyjs_asset():
+        """File name of the shared bundle, versioned so upgrades never reuse a stale copy"""
+        from plotly.offline import get_plotlyjs_version
+        return f"plotly-{get_plotlyjs_version()}.min.js"
+    
+    def _shared_plotlyjs(self, directory):
+        """Write the plotly.js bundle to a directory once and return its relative script src"""
+        asset = self._plotlyjs_asset()
+        path = directory / asset
+        if directory not in self._shared_dirs:
+            if not path.exists():
+                from plotly.offline import get_plotlyjs
+                directory.mkdir(parents=True, exist_ok=True)
+                # Written under a temporary name so concurrent writers never expose a partial bundle
+                tmp_path = directory / f".tmp-{os.getpid()}-{threading.get_ident()}-{asset}"
+                tmp_path.write_text(get_plotlyjs(), encoding='utf-8')
+                os.replace(tmp_path, path)
+            self._shared_dirs.add(directory)
+        return asset
+    
+    def chart_size_report(self, directory='.'):
+        """
+        Report the size of the HTML charts in a directory
+        
+        Returns:
+            dict: Chart count, chart and shared bundle bytes, and the bytes
+                saved against inlining plotly.js into every chart that
+                references the shared bundle
+        """
+        directory = Path(directory)
+        asset = directory / self._plotlyjs_asset()
+        asset_bytes = asset.stat().st_size if asset.exists() else 0
+        
+        charts, html_bytes, shared = 0, 0, 0
+        for path in directory.glob('*.html'):
+            charts += 1
+            html_bytes += path.stat().st_size
+            if asset_bytes and f'src="{asset.name}"' in path.read_text(encoding='utf-8', errors='ignore'):
+                shared += 1
+        
+        report = {
+            'charts': charts,
+            'shared_charts': shared,
+            'html_bytes': html_bytes,
+            'asset_bytes': asset_bytes,
+            'total_bytes': html_bytes + asset_bytes,
+            'saved_bytes': max(shared * asset_bytes - asset_bytes, 0),
+        }
+        print(f"{charts} charts in {directory}: {report['total_bytes'] / 2 ** 20:.1f} MiB "
+              f"({report['saved_bytes'] / 2 ** 20:.1f} MiB saved by the shared plotly.js)")
+        return report
+    
+    def start_renderers(self, renderers=DEFAULT_RENDERERS):
+        """
+        Start a warm pool of static-image renderers
+        
+        The pool is one headless Chrome with `renderers` Kaleido tabs, kept open
+        until stop_renderers is called or the interpreter exits. While it runs,
+        export_images and PNG/PDF save_chart calls skip browser start-up.
+        
+        A failed start (e.g. Chrome not installed) is raised again on later
+        calls without another attempt.
+        
+        Args:
+            renderers (int): Figures rendered at once
+        """
+        if self._renderer_error is not None:
+            raise self._renderer_error
+        if self._renderers is None:
+            try:
+                self._renderers = _RendererPool(renderers)
+            except Exception as e:
+                self._renderer_error = e
+                raise
+            atexit.register(self.stop_renderers)
+        return self._renderers
+    
+    def stop_renderers(self):
+        """Shut the renderer pool down"""
+        if self._renderers is not None:
+            pool, self._renderers = self._renderers, None
+            pool.close()
+    
+    def export_images(self, jobs, renderers=DEFAULT_RENDERERS, width=None, height=None, scale=None):
+        """
+        Export many figures to static images on the warm renderer pool
+        
+        Args:
+            jobs (list): (figure, path) or (figure, path, format) tuples; the
+                format defaults to the path suffix
+            renderers (int): Pool size if the pool is not running yet
+            width (int): Image width in layout pixels (optional)
+            height (int): Image height in layout pixels (optional)
+            scale (float): Resolution scale factor (optional)
+        
+        Returns:
+            dict: Image and failure counts, bytes written, seconds and images per
+                second, and the error of each failed job
+        """
+        start = time.perf_counter()
+        specs = []
+        for job in jobs:
+            fig, path = job[0], Path(job[1])
+            format = job[2] if len(job) > 2 else path.suffix.lstrip('.').lower()
+            if format not in IMAGE_FORMATS:
+                raise ValueError(f"Unknown image format '{format}', expected one of {IMAGE_FORMATS}")
+            path.parent.mkdir(parents=True, exist_ok=True)
+            opts = {'format': format}
+            opts.update({key: value for key, value in
+                         (('width', width), ('height', height), ('scale', scale)) if value is not None})
+            specs.append({'fig': fig, 'path': path, 'opts': opts})
+        
+        errors = self.start_renderers(renderers).render(specs) if specs else ()
+        duration = time.perf_counter() - start
+        written = [spec['path'] for spec in specs if spec['path'].exists()]
+        stats = {
+            'images': len(specs),
+            'failed': len(errors),
+            'bytes_written': sum(path.stat().st_size for path in written),
+            'duration_s': duration,
+            'images_per_s': len(specs) / duration if duration > 0 else 0.0,
+            'errors': [str(error) for error in errors],
+        }
+        print(f"Exported {stats['images'] - stats['failed']}/{stats['images']} images "
+              f"in {duration:.2f} s ({stats['images_per_s']:.1f} images/s)")
+        return stats
+
+def _yearly_totals(df):
+    """Per-year totals of the trend metrics, from market rows or an existing summary"""
+    return df.groupby('year', observed=True, sort=True)[TREND_METRICS].sum().reset_index()
+
+def _region_totals(df):
+    """Per-region capacity and market value totals"""
+    columns = ['installed_capacity_mw', 'market_value_million_usd']
+    return df.groupby('region', observed=True, sort=True)[columns].sum().reset_index()
+
+# Charts generate_batch can build: (chart method, per-group preparation or None)
+BATCH_CHARTS = {
+    'market_trends': ('create_market_trends_chart', _yearly_totals),
+    'regional_analysis': ('create_regional_analysis_chart', _region_totals),
+    'competitor_analysis': ('create_competitor_analysis_chart', None),
+    'customer_segmentation': ('create_customer_segmentation_chart', None),
+}
+
+# Generator of each batch worker process, by generator options
+_batch_generators = {}
+
+def _render_group(generator, chart, group, label, data, path, format):
+    """Build and save one group's chart, titled with its group label, returning its manifest entry"""
+    start = time.perf_counter()
+    method, prepare = BATCH_CHARTS[chart]
+    entry = {'group': group, 'path': str(path), 'rows': len(data), 'status': 'ok', 'error': None,
+             'pid': os.getpid(), 'build_s': 0.0, 'save_s': 0.0}
+    try:
+        if prepare is not None:
+            data = prepare(data)
+        build = getattr(generator, method)
+        title = inspect.signature(build).parameters['title'].default
+        fig = build(data, title=f"{title} - {label}")
+        built = time.perf_counter()
+        entry['build_s'] = built - start
+        generator._write_chart(fig, path, format)
+        entry['save_s'] = time.perf_counter() - built
+    except Exception as e:
+        entry.update(status='error', error=str(e))
+    entry['total_s'] = time.perf_counter() - start
+    return entry
+
+def _render_group_worker(options, *task):
+    """Process pool entry point: render with this process's cached generator"""
+    generator = _batch_generators.get(options)
+    if generator is None:
+        generator = _batch_generators[options] = HydroChartGenerator(**dict(options))
+    return _render_group(generator, *task)
 
 def main():
     """Example usage of the chart generator"""
     try:
+        import functools
         import sys
         import os
         # Add the parent directory to the path to import data_loader
         sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'data_processing'))
-        from data_loader import HydroDataLoader
+        from data_loader import HydroDataLoader, add_market_steps
+        from build_graph import BuildGraph
         
-        # Load data
         loader = HydroDataLoader()
-        market_data = loader.load_market_data()
-        competitor_data = loader.load_competitor_data()
-        customer_data = loader.load_customer_data()
+        if not loader.market_source_files():
+            print("No market data available. Please check data files.")
+            return
         
-        # Create chart generator
-        chart_gen = HydroChartGenerator()
+        # Charts are only rebuilt when the raw market data changed since the last run
+        graph = BuildGraph(loader.processed_path / "build_state.json")
+        add_market_steps(graph, loader)
         
-        if market_data is not None:
-            # Generate market summary
-            market_summary = loader.get_market_summary(market_data)
-            
-            # Create charts
-            trends_chart = chart_gen.create_market_trends_chart(market_summary)
-            regional_chart = chart_gen.create_regional_analysis_chart(
-                loader.get_regional_analysis(market_data)
-            )
-            
-            # Save charts
-            chart_gen.save_chart(trends_chart, "market_trends.html")
-            chart_gen.save_chart(regional_chart, "regional_analysis.html")
-            
-            print("Charts generated successfully!")
-        else:
-            print("No market data available. Please check data files.")
+        # Save steps block on their writes and raise on failure, so the graph
+        # never records a failed save as built
+        for name in ('market_summary', 'regional_analysis'):
+            graph.add(f'save_{name}_parquet',
+                      lambda df, name=name: loader.save_processed_data(df, f"{name}.parquet"),
+                      deps=[name], outputs=[loader.processed_path / f"{name}.parquet"])
+        
+        # The chart generator is only created when a chart has to be rebuilt
+        charts = functools.cache(HydroChartGenerator)
+        
+        # Create charts
+        graph.add('market_trends_chart', lambda df: charts().create_market_trends_chart(df),
+                  deps=['market_summary'])
+        graph.add('regional_analysis_chart', lambda df: charts().create_regional_analysis_chart(df),
+                  deps=['regional_analysis'])
+        
+        # Save charts
+        for name in ('market_trends', 'regional_analysis'):
+            graph.add(f'save_{name}_chart',
+                      lambda fig, name=name: charts()._write_chart(fig, f"{name}.html"),
+                      deps=[f'{name}_chart'], outputs=[f"{name}.html"])
+        
+        report = graph.run()
+        print(report.summary())
+        print("Charts generated successfully!")
             
     except ImportError as e:
         print(f"Import error: {e}")
@@ -0,0 +1,60 @@
+"""
+Downsampling Module for Brazil Hydro Energy Sector Analysis
+Reduces long series to a point budget before they are drawn
+"""
+
+import numpy as np
+
+# Default number of points kept per series by the time-series charts
+LTTB_MAX_POINTS = 2_000
+
+def lttb_indices(x, y, n_out):
+    """
+    Select the points Largest-Triangle-Three-Buckets keeps from a series
+    
+    The first and last points are always kept. The interior is split into
+    n_out - 2 buckets and each bucket keeps the point forming the largest
+    triangle with the previously kept point and the mean of the next bucket,
+    which preserves peaks and troughs that plain striding drops. Bucket means
+    come from one vectorized pass and each bucket is scored as a whole; only
+    the walk from bucket to bucket is sequential.
+    
+    Args:
+        x (array-like): Sorted x values (numeric or datetime64)
+        y (array-like): y values
+        n_out (int): Points to keep (at least 3)
+    
+    Returns:
+        np.ndarray: Increasing indices of the kept points
+    """
+    x = np.asarray(x)
+    if np.issubdtype(x.dtype, np.datetime64):
+        x = x.view('int64')
+    x = x.astype('float64')
+    y = np.asarray(y, dtype='float64')
+    n = len(y)
+    if n_out >= n:
+        return np.arange(n)
+    if n_out < 3:
+        raise ValueError(f"LTTB needs a budget of at least 3 points, got {n_out}")
+    
+    # Interior points 1..n-2 split into n_out - 2 buckets of at least one point
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.intp)
+    counts = np.diff(edges)
+    mean_x = np.add.reduceat(x[:-1], edges[:-1]) / counts
+    mean_y = np.add.reduceat(y[:-1], edges[:-1]) / counts
+    # Each bucket looks ahead to the next bucket's mean; the last one to the final point
+    next_x = np.append(mean_x[1:], x[-1])
+    next_y = np.append(mean_y[1:], y[-1])
+    
+    keep = np.empty(n_out, dtype=np.intp)
+    keep[0], keep[-1] = 0, n - 1
+    a = 0
+    for i in range(n_out - 2):
+        lo, hi = edges[i], edges[i + 1]
+        ax, ay = x[a], y[a]
+        # Twice the triangle area, for every candidate in the bucket at once
+        area = np.abs((ax - next_x[i]) * (y[lo:hi] - ay) - (ax - x[lo:hi]) * (next_y[i] - ay))
+        a = lo + int(np.argmax(np.nan_to_num(area, nan=-1.0)))
+        keep[i + 1] = a
+    return keep
@@ -0,0 +1,58 @@
+"""
+Regression tests for the Brazil Hydro Energy data loader
+"""
+
+from pathlib import Path
+import shutil
+import sys
+import tempfile
+import unittest
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from src.data_processing.data_loader import HydroDataLoader
+
+class CacheFilesTest(unittest.TestCase):
+    """Parquet cache entries of same-named raw files"""
+    
+    def setUp(self):
+        self.data_dir = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.data_dir)
+        self.files = []
+        for year in (2023, 2024):
+            path = self.data_dir / 'raw' / str(year) / 'market.csv'
+            path.parent.mkdir(parents=True)
+            pd.DataFrame({
+                'year': [year] * 2,
+                'region': ['North', 'South'],
+                'installed_capacity_mw': [float(year), 1.0],
+                'generation_gwh': [1.0, 2.0],
+                'market_value_million_usd': [1.0, 2.0],
+                'investment_million_usd': [1.0, 2.0],
+                'number_of_plants': [1, 2],
+            }).to_csv(path, index=False)
+            self.files.append(f"{year}/market.csv")
+    
+    def test_same_name_in_two_directories(self):
+        loader = HydroDataLoader(str(self.data_dir))
+        cache_2023 = loader._cache_files(loader._resolve_files(self.files[0])[0])
+        cache_2024 = loader._cache_files(loader._resolve_files(self.files[1])[0])
+        self.assertNotEqual(cache_2023, cache_2024)
+        
+        loader.load_market_data(files=self.files, workers=2)
+        for name, year in zip(self.files, (2023, 2024)):
+            # A fresh loader reads through the Parquet cache written above
+            df = HydroDataLoader(str(self.data_dir)).load_market_data(files=[name])
+            self.assertEqual(df['year'].unique().tolist(), [year])
+    
+    def test_filter_empties_one_file(self):
+        # Load once to fill the Parquet cache, then read the empty part back from it
+        for _ in range(2):
+            df = HydroDataLoader(str(self.data_dir)).load_market_data(files=self.files, years=2024)
+            self.assertEqual(len(df), 2)
+            self.assertIsInstance(df['region'].dtype, pd.CategoricalDtype)
+
+if __name__ == '__main__':
+    unittest.main()